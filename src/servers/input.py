@@ -4,32 +4,235 @@ Input utilities for desktop automation.
 Provides mouse and keyboard control functions with configurable speed.
 """
 
+import functools
+import os
+import string
+import threading
+import time
 from typing import Literal
 
-import pyautogui
-
-# Configure pyautogui safety features
-pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+try:
+    # python-xlib only uses real locks if this is imported before a Display is
+    # opened (pyautogui opens one when first imported); the server calls into
+    # X from worker threads.
+    import Xlib.threaded  # noqa: F401
+except ImportError:
+    pass
+
+try:
+    from Xlib import X
+    from Xlib import display as xdisplay
+    from Xlib.ext import xtest
+except ImportError:  # Non-X11 backends: read and act through pyautogui
+    xdisplay = None
 
 # Default pause - can be reduced for faster loops
 _DEFAULT_PAUSE = 0.05  # 50ms between actions (was 0.1)
-pyautogui.PAUSE = _DEFAULT_PAUSE
 
 MouseButton = Literal["left", "right", "middle"]
 
 
+@functools.lru_cache(maxsize=None)
+def _pyautogui():
+    """
+    Import and configure pyautogui on first use.
+
+    Deferred so server startup (repeated per session on stdio) skips its
+    import chain and X connection; pointer reads and XTest input go through
+    python-xlib directly and often never need it.
+    """
+    import pyautogui
+
+    # Configure pyautogui safety features
+    pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+    pyautogui.PAUSE = _DEFAULT_PAUSE
+    return pyautogui
+
+
+# Shared X connection for direct reads and XTest input. Xlib displays are not
+# thread-safe.
+_x_display = None
+_x_has_xtest = False
+_x_lock = threading.Lock()
+
+_X_BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+# Last pointer read, reused for back-to-back reads within one tool call.
+# Anything that moves the pointer clears it.
+_MOUSE_TTL_NS = 5_000_000
+_mouse_cache: tuple[int, tuple[int, int]] | None = None
+
+
+def _forget_mouse_position():
+    """Drop the cached pointer position."""
+    global _mouse_cache
+    _mouse_cache = None
+
+
+def _moves_pointer(func):
+    """Invalidate the cached pointer position around a function that moves it."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _forget_mouse_position()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _forget_mouse_position()
+    return wrapper
+
+
+def _get_x_display():
+    """Return the shared Xlib display connection, or None if unavailable."""
+    global _x_display, _x_has_xtest
+    if _x_display is None and xdisplay is not None and os.environ.get("DISPLAY"):
+        _x_display = xdisplay.Display()
+        _x_has_xtest = _x_display.has_extension("XTEST")
+    return _x_display
+
+
+def _check_failsafe(disp):
+    """Raise pyautogui's FailSafeException if the pointer sits in a screen corner."""
+    with _x_lock:
+        screen = disp.screen()
+        pointer = screen.root.query_pointer()
+    max_x, max_y = screen.width_in_pixels - 1, screen.height_in_pixels - 1
+    if pointer.root_x in (0, max_x) and pointer.root_y in (0, max_y):
+        # In a fail-safe corner: let pyautogui decide (honors FAILSAFE) and raise
+        _pyautogui().failSafeCheck()
+
+
+@_moves_pointer
+def _xtest_move_click(
+    x: int,
+    y: int,
+    button: MouseButton | None,
+    clicks: int,
+    interval: float,
+    pause: bool = True,
+) -> bool:
+    """
+    Move (and optionally click) with raw XTest events on the shared display.
+
+    Skips pyautogui's screen-size lookups and tweening. The fail-safe corner
+    is still honored, and unless ``pause`` is False the action pause is
+    slept once afterwards as pyautogui would. Returns False if XTest is unavailable, so the caller
+    can fall back to pyautogui.
+    """
+    with _x_lock:
+        disp = _get_x_display()
+        if disp is None or not _x_has_xtest:
+            return False
+
+    _check_failsafe(disp)
+    with _x_lock:
+        xtest.fake_input(disp, X.MotionNotify, x=x, y=y)
+        disp.sync()
+    if button is not None:
+        code = _X_BUTTONS[button]
+        for i in range(clicks):
+            if i:
+                time.sleep(interval)
+            with _x_lock:
+                xtest.fake_input(disp, X.ButtonPress, code)
+                xtest.fake_input(disp, X.ButtonRelease, code)
+                disp.sync()
+    if pause:
+        # Same settle time pyautogui's PAUSE gives, so set_action_pause still paces slow apps
+        time.sleep(_DEFAULT_PAUSE)
+    return True
+
+
+# Keysyms for control characters; printable Latin-1 keysyms equal the code point
+_SPECIAL_KEYSYMS = {"\n": 0xFF0D, "\r": 0xFF0D, "\t": 0xFF09}
+_XK_SHIFT_L = 0xFFE1
+# Keys sent per request batch, and the most server-side delay one batch may
+# queue. A delayed fake_input stalls every later request on the connection,
+# so batches are kept short and the X lock is released between them.
+_TYPE_CHUNK = 32
+_TYPE_BATCH_SECONDS = 0.05
+_key_table: dict[str, tuple[int, bool]] | None = None
+
+
+def _get_key_table(disp) -> dict[str, tuple[int, bool]]:
+    """
+    Map typeable characters to (keycode, needs_shift) on the current keymap, built once.
+
+    Only keysyms on a key's plain or shifted level are included; ones that
+    need AltGr or Mode_switch are left out so typing falls back to pyautogui.
+    """
+    global _key_table
+    if _key_table is None:
+        table = {}
+        for char in string.printable:
+            keysym = _SPECIAL_KEYSYMS.get(char, ord(char))
+            keycode = disp.keysym_to_keycode(keysym)
+            if not keycode:
+                continue
+            if disp.keycode_to_keysym(keycode, 0) == keysym:
+                table[char] = (keycode, False)
+            elif disp.keycode_to_keysym(keycode, 1) == keysym:
+                table[char] = (keycode, True)
+        _key_table = table
+    return _key_table
+
+
+def _xtest_type(text: str, interval: float) -> bool:
+    """
+    Type text with raw XTest key events on the shared display.
+
+    The inter-key interval is passed as the XTest event delay, so the X
+    server paces the keystrokes and no Python sleeps happen per character;
+    the action pause is slept once at the end, like pyautogui.typewrite.
+    Returns False if XTest is unavailable or a character has no key on the
+    current layout, so the caller can fall back to pyautogui.
+    """
+    with _x_lock:
+        disp = _get_x_display()
+        if disp is None or not _x_has_xtest:
+            return False
+        table = _get_key_table(disp)
+        shift = disp.keysym_to_keycode(_XK_SHIFT_L)
+
+    keys = [table.get(char) for char in text]
+    if not shift or None in keys:
+        return False
+
+    _check_failsafe(disp)
+    delay = max(0, round(interval * 1000))
+    chunk = _TYPE_CHUNK
+    if interval > 0:
+        chunk = max(1, min(chunk, int(_TYPE_BATCH_SECONDS / interval)))
+    for start in range(0, len(keys), chunk):
+        with _x_lock:
+            for offset, (keycode, shifted) in enumerate(keys[start:start + chunk]):
+                when = delay if start + offset else 0
+                if shifted:
+                    xtest.fake_input(disp, X.KeyPress, shift, time=when)
+                    when = 0
+                xtest.fake_input(disp, X.KeyPress, keycode, time=when)
+                xtest.fake_input(disp, X.KeyRelease, keycode)
+                if shifted:
+                    xtest.fake_input(disp, X.KeyRelease, shift)
+            # Returns once the server has played the batch, delays included
+            disp.sync()
+    time.sleep(_DEFAULT_PAUSE)
+    return True
+
+
 def set_action_pause(pause: float):
     """Set the pause between pyautogui actions (in seconds)."""
     global _DEFAULT_PAUSE
     _DEFAULT_PAUSE = pause
-    pyautogui.PAUSE = pause
+    if _pyautogui.cache_info().currsize:
+        _pyautogui().PAUSE = pause
 
 
 def get_action_pause() -> float:
     """Get current pause between actions."""
-    return pyautogui.PAUSE
+    return _DEFAULT_PAUSE
 
 
+@_moves_pointer
 def mouse_move(
     x: int,
     y: int,
@@ -49,19 +252,22 @@ def mouse_move(
         Final (x, y) position
     """
     if relative:
-        pyautogui.moveRel(x, y, duration=duration)
+        _pyautogui().moveRel(x, y, duration=duration)
     else:
-        pyautogui.moveTo(x, y, duration=duration)
+        _pyautogui().moveTo(x, y, duration=duration)
 
-    return pyautogui.position()
+    return get_mouse_position()
 
 
+@_moves_pointer
 def instant_move(x: int, y: int) -> tuple[int, int]:
-    """Move mouse instantly to coordinates (no duration, no tween)."""
-    pyautogui.moveTo(x, y, duration=0, _pause=False)
-    return pyautogui.position()
+    """Move mouse instantly to coordinates (no duration, no tween, no pause)."""
+    if not _xtest_move_click(x, y, None, 0, 0.0, pause=False):
+        _pyautogui().moveTo(x, y, duration=0, _pause=False)
+    return get_mouse_position()
 
 
+@_moves_pointer
 def mouse_click(
     x: int | None = None,
     y: int | None = None,
@@ -83,14 +289,15 @@ def mouse_click(
         Click position (x, y)
     """
     if x is not None and y is not None:
-        pyautogui.click(x, y, clicks=clicks, interval=interval, button=button)
+        _pyautogui().click(x, y, clicks=clicks, interval=interval, button=button)
         return (x, y)
     else:
-        pos = pyautogui.position()
-        pyautogui.click(clicks=clicks, interval=interval, button=button)
+        pos = get_mouse_position()
+        _pyautogui().click(clicks=clicks, interval=interval, button=button)
         return pos
 
 
+@_moves_pointer
 def mouse_drag(
     start_x: int,
     start_y: int,
@@ -113,8 +320,8 @@ def mouse_drag(
     Returns:
         Dict with start and end positions
     """
-    pyautogui.moveTo(start_x, start_y)
-    pyautogui.drag(end_x - start_x, end_y - start_y, duration=duration, button=button)
+    _pyautogui().moveTo(start_x, start_y)
+    _pyautogui().drag(end_x - start_x, end_y - start_y, duration=duration, button=button)
 
     return {
         "start": {"x": start_x, "y": start_y},
@@ -122,6 +329,7 @@ def mouse_drag(
     }
 
 
+@_moves_pointer
 def mouse_scroll(
     clicks: int,
     x: int | None = None,
@@ -139,11 +347,11 @@ def mouse_scroll(
         Current mouse position
     """
     if x is not None and y is not None:
-        pyautogui.scroll(clicks, x, y)
+        _pyautogui().scroll(clicks, x, y)
     else:
-        pyautogui.scroll(clicks)
+        _pyautogui().scroll(clicks)
 
-    return pyautogui.position()
+    return get_mouse_position()
 
 
 def keyboard_type(
@@ -160,7 +368,8 @@ def keyboard_type(
     Returns:
         Number of characters typed
     """
-    pyautogui.typewrite(text, interval=interval)
+    if not _xtest_type(text, interval):
+        _pyautogui().typewrite(text, interval=interval)
     return len(text)
 
 
@@ -180,7 +389,7 @@ def keyboard_press(
     Returns:
         The key that was pressed
     """
-    pyautogui.press(key, presses=presses, interval=interval)
+    _pyautogui().press(key, presses=presses, interval=interval)
     return key
 
 
@@ -194,15 +403,48 @@ def keyboard_hotkey(*keys: str) -> list[str]:
     Returns:
         List of keys pressed
     """
-    pyautogui.hotkey(*keys)
+    _pyautogui().hotkey(*keys)
     return list(keys)
 
 
 def get_mouse_position() -> tuple[int, int]:
-    """Return current mouse position as (x, y)."""
-    return pyautogui.position()
-
+    """
+    Return current mouse position as (x, y), queried straight from the X server.
 
+    A read less than 5 ms old is reused unless the pointer was moved since.
+    """
+    global _mouse_cache
+    now = time.monotonic_ns()
+    cached = _mouse_cache
+    if cached is not None and now - cached[0] < _MOUSE_TTL_NS:
+        return cached[1]
+
+    with _x_lock:
+        disp = _get_x_display()
+        if disp is not None:
+            pointer = disp.screen().root.query_pointer()
+            pos = (pointer.root_x, pointer.root_y)
+        else:
+            pos = None
+    if pos is None:
+        x, y = _pyautogui().position()
+        pos = (x, y)
+    _mouse_cache = (now, pos)
+    return pos
+
+
+def get_screen_size() -> tuple[int, int]:
+    """Return the screen size as (width, height), read from the shared X display."""
+    with _x_lock:
+        disp = _get_x_display()
+        if disp is not None:
+            screen = disp.screen()
+            return screen.width_in_pixels, screen.height_in_pixels
+    width, height = _pyautogui().size()
+    return width, height
+
+
+@_moves_pointer
 def fast_click(
     x: int,
     y: int,
@@ -221,12 +463,14 @@ def fast_click(
     Returns:
         Click position (x, y)
     """
-    # Use _pause=False for the move to avoid extra delay
-    pyautogui.moveTo(x, y, duration=0, _pause=False)
-    pyautogui.click(clicks=clicks, interval=0.02, button=button)
+    if not _xtest_move_click(x, y, button, clicks, 0.02):
+        # Use _pause=False for the move to avoid extra delay
+        _pyautogui().moveTo(x, y, duration=0, _pause=False)
+        _pyautogui().click(clicks=clicks, interval=0.02, button=button)
     return (x, y)
 
 
+@_moves_pointer
 def move_and_click(
     x: int,
     y: int,
@@ -250,13 +494,13 @@ def move_and_click(
         Dict with final position and action details
     """
     if move_duration > 0:
-        pyautogui.moveTo(x, y, duration=move_duration)
+        _pyautogui().moveTo(x, y, duration=move_duration)
     else:
-        pyautogui.moveTo(x, y, duration=0, _pause=False)
+        _pyautogui().moveTo(x, y, duration=0, _pause=False)
     
-    pyautogui.click(clicks=clicks, interval=click_interval, button=button)
+    _pyautogui().click(clicks=clicks, interval=click_interval, button=button)
     
-    final_pos = pyautogui.position()
+    final_pos = get_mouse_position()
     return {
         "x": final_pos[0],
         "y": final_pos[1],
@@ -20,7 +20,12 @@ Usage:
     ubuntu-commander --transport sse --port 8765
 """
 
+import asyncio
+import functools
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated, Literal
 
 from mcp.server.fastmcp import FastMCP
@@ -30,6 +35,7 @@ from .input import (
     fast_click,
     get_action_pause,
     get_mouse_position,
+    get_screen_size,
     instant_move,
     keyboard_hotkey,
     keyboard_press,
@@ -48,9 +54,10 @@ from .vision import (
     find_text_in_ocr_cache,
     find_text_on_screen,
     get_frame_cache_age_ms,
-    get_screen_size,
     invalidate_frame_cache,
-    ocr_full_screen,
+    ocr_full_screen_top,
+    ocr_regions,
+    warmup,
 )
 
 
@@ -77,6 +84,77 @@ Workflow pattern:
     dependencies=["pyautogui", "Pillow", "pytesseract"],
 )
 
+# Load the OCR models and initialize OpenCV/JPEG in the background so the
+# first get_screen/analyze_screen call does not pay for it.
+threading.Thread(target=warmup, daemon=True).start()
+
+
+# Screenshots, OCR and template matching take tens to hundreds of ms and mostly
+# release the GIL (Tesseract, OpenCV, libjpeg). Running them here keeps the
+# event loop free to serve other tool calls meanwhile.
+_vision_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="vision")
+
+
+async def _run_blocking(func, *args, **kwargs):
+    """Run a blocking vision call on the vision executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_vision_executor, functools.partial(func, *args, **kwargs))
+
+
+def _screen_state() -> dict:
+    """
+    Snapshot screen size and mouse position for a tool result.
+
+    Both come from input's shared Xlib display: the size from its connection
+    setup data (no request) and the position from one pointer query.
+    """
+    width, height = get_screen_size()
+    mouse_x, mouse_y = get_mouse_position()
+    return {
+        "screen": {"width": width, "height": height},
+        "mouse": {"x": mouse_x, "y": mouse_y},
+    }
+
+
+_DEFAULT_QUALITY = 50
+_SMALL_REGION_FRACTION = 0.25
+
+
+def _auto_quality(region: tuple[int, int, int, int] | None) -> int:
+    """Default JPEG quality: higher for small regions, where bytes are cheap and detail matters."""
+    if region is None:
+        return _DEFAULT_QUALITY
+    width, height = get_screen_size()
+    if region[2] * region[3] < _SMALL_REGION_FRACTION * width * height:
+        return min(85, _DEFAULT_QUALITY + 20)
+    return _DEFAULT_QUALITY
+
+
+def _parse_region(region: dict) -> tuple[int, int, int, int]:
+    """Convert a {x, y, width, height} dict to a region tuple."""
+    try:
+        return (
+            int(region["x"]),
+            int(region["y"]),
+            int(region["width"]),
+            int(region["height"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("region must have keys: x, y, width, height")
+
+
+def _text_element(m) -> dict:
+    """Convert a text ElementMatch to an analyze_screen element."""
+    cx, cy = m.bbox.center
+    return {
+        "type": "text",
+        "text": m.text,
+        "x": cx,
+        "y": cy,
+        "bbox": m.bbox.to_dict(),
+        "confidence": m.confidence,
+    }
+
 
 # =============================================================================
 # TOOL 1: get_screen - Observation (screenshot + metadata)
@@ -84,12 +162,19 @@ Workflow pattern:
 
 
 @mcp.tool()
-def get_screen(
+async def get_screen(
     region: Annotated[
         dict | None,
         "Capture region only: {x, y, width, height}. Omit for fullscreen.",
     ] = None,
-    quality: Annotated[int, "JPEG quality 1-100. Lower=smaller file. Default 50."] = 50,
+    quality: Annotated[
+        int | None,
+        "JPEG quality 1-100. Lower=smaller file. Default 50, raised for small regions.",
+    ] = None,
+    adaptive_quality: Annotated[
+        bool,
+        "Pick JPEG quality per frame when polling: higher while the screen is static, lower while it changes. Overrides quality.",
+    ] = False,
 ) -> Image:
     """
     Capture a screenshot of the screen with display metadata.
@@ -103,7 +188,11 @@ def get_screen(
 
     Args:
         region: Optional {x, y, width, height} to capture only a portion
-        quality: JPEG quality 1-100 (50 recommended for balance of size/clarity)
+        quality: JPEG quality 1-100 (50 recommended for balance of size/clarity).
+            When omitted, regions under a quarter of the screen get 70 since
+            they are small anyway and usually hold text worth reading.
+        adaptive_quality: For repeated captures, choose quality (40-85) from how
+            much the screen changed since the previous one and recent image sizes
 
     Returns:
         Screenshot image viewable by the model.
@@ -115,27 +204,28 @@ def get_screen(
         # Capture specific region
         get_screen(region={"x": 100, "y": 100, "width": 400, "height": 300})
     """
-    region_tuple = None
-    if region:
-        try:
-            region_tuple = (
-                int(region["x"]),
-                int(region["y"]),
-                int(region["width"]),
-                int(region["height"]),
-            )
-        except (KeyError, TypeError, ValueError):
-            raise ValueError("region must have keys: x, y, width, height")
+    region_tuple = _parse_region(region) if region else None
+    data, fmt = await _run_blocking(_get_screen, region_tuple, quality, adaptive_quality)
+    return Image(data=data, format=fmt)
 
-    # Capture with metadata for cache
-    if region_tuple:
-        data, fmt = capture_screenshot(quality=quality, format="jpeg", region=region_tuple)
-    else:
-        meta = capture_with_metadata(quality=quality, format="jpeg")
-        data = meta["image_bytes"]
-        fmt = meta["format"]
 
-    return Image(data=data, format=fmt)
+def _get_screen(
+    region: tuple[int, int, int, int] | None,
+    quality: int | None,
+    adaptive_quality: bool,
+) -> tuple[bytes, str]:
+    """Blocking body of get_screen, run on the vision executor."""
+    # The screen-size read behind the auto quality may open the X connection
+    if quality is None:
+        quality = _auto_quality(region)
+
+    # Capture with metadata for cache
+    if region:
+        return capture_screenshot(
+            quality=quality, format="jpeg", region=region, adaptive_quality=adaptive_quality
+        )
+    meta = capture_with_metadata(quality=quality, format="jpeg", adaptive_quality=adaptive_quality)
+    return meta["image_bytes"], meta["format"]
 
 
 # =============================================================================
@@ -144,7 +234,7 @@ def get_screen(
 
 
 @mcp.tool()
-def analyze_screen(
+async def analyze_screen(
     find_text: Annotated[
         str | None,
         "Search for specific text. Returns matching elements sorted by confidence.",
@@ -161,6 +251,18 @@ def analyze_screen(
         bool,
         "Reuse cached OCR data if available (faster). Set False to force fresh scan.",
     ] = True,
+    regions: Annotated[
+        list[dict] | None,
+        "OCR only these areas, in parallel: [{x, y, width, height}, ...]. Returns text per region.",
+    ] = None,
+    match_method: Annotated[
+        Literal["template", "features"],
+        "find_image matching: 'template' (exact pixels, all matches) or 'features' (scale-tolerant, best match).",
+    ] = "template",
+    psm: Annotated[
+        int | None,
+        "Tesseract page segmentation mode. Default 3 (auto layout), 6 for regions; 11 for sparse text.",
+    ] = None,
 ) -> dict:
     """
     Analyze the screen to find GUI elements and their positions.
@@ -179,12 +281,19 @@ def analyze_screen(
         find_image: Path to template image file to locate on screen
         confidence: Minimum match confidence (0.0-1.0)
         use_cache: Use cached OCR results if fresh (default True)
+        regions: OCR only these {x, y, width, height} areas, concurrently.
+            Combine with find_text to keep only matching words.
+        match_method: How find_image is matched. "features" uses SIFT/ORB
+            keypoints, so it still finds icons drawn at another scale.
+        psm: Tesseract page segmentation mode override. 11 (sparse text)
+            suits scattered labels; 6 (uniform block) a single panel.
 
     Returns:
         Dict with:
         - screen: {width, height}
         - mouse: {x, y} current position
         - elements: List of found elements with {text, x, y, width, height, confidence}
+        - regions: Per-region {region, text, elements} (if regions given)
         - cache_age_ms: Age of cached data (if used)
 
     Example workflow:
@@ -194,13 +303,25 @@ def analyze_screen(
             elem = result["elements"][0]  # Best match
             use_mouse(action="click", x=elem["x"], y=elem["y"])
     """
-    width, height = get_screen_size()
-    mouse_x, mouse_y = get_mouse_position()
+    return await _run_blocking(
+        _analyze_screen, find_text, find_image, confidence, use_cache, regions, match_method, psm
+    )
+
+
+def _analyze_screen(
+    find_text: str | None,
+    find_image: str | None,
+    confidence: float,
+    use_cache: bool,
+    regions: list[dict] | None,
+    match_method: Literal["template", "features"],
+    psm: int | None,
+) -> dict:
+    """Blocking body of analyze_screen, run on the vision executor."""
     cache_age = get_frame_cache_age_ms()
 
     result = {
-        "screen": {"width": width, "height": height},
-        "mouse": {"x": mouse_x, "y": mouse_y},
+        **_screen_state(),
         "elements": [],
         "cache_age_ms": cache_age,
         "timestamp": time.time(),
@@ -208,7 +329,9 @@ def analyze_screen(
 
     # Template matching for images
     if find_image:
-        matches = find_template_on_screen(find_image, confidence=confidence or 0.8)
+        matches = find_template_on_screen(
+            find_image, confidence=confidence or 0.8, method=match_method
+        )
         for m in matches:
             cx, cy = m.bbox.center
             result["elements"].append({
@@ -220,37 +343,43 @@ def analyze_screen(
             })
         return result
 
+    # Parallel OCR of specific regions
+    if regions:
+        region_tuples = [_parse_region(r) for r in regions]
+        per_region = ocr_regions(
+            region_tuples, min_confidence=confidence, psm=6 if psm is None else psm
+        )
+        needle = find_text.lower() if find_text else None
+        result["regions"] = []
+        for (rx, ry, rw, rh), matches in zip(region_tuples, per_region):
+            if needle:
+                matches = [m for m in matches if needle in m.text.lower()]
+            elements = [_text_element(m) for m in matches]
+            result["regions"].append({
+                "region": {"x": rx, "y": ry, "width": rw, "height": rh},
+                "text": " ".join(m.text for m in matches),
+                "elements": elements,
+            })
+            result["elements"].extend(elements)
+        return result
+
     # OCR for text
     if find_text:
         # Try cache first
         if use_cache:
-            cached_matches = find_text_in_ocr_cache(find_text, min_confidence=confidence)
+            cached_matches = find_text_in_ocr_cache(
+                find_text, min_confidence=confidence, psm=psm or 3
+            )
             if cached_matches:
-                for m in cached_matches:
-                    cx, cy = m.bbox.center
-                    result["elements"].append({
-                        "type": "text",
-                        "text": m.text,
-                        "x": cx,
-                        "y": cy,
-                        "bbox": m.bbox.to_dict(),
-                        "confidence": m.confidence,
-                    })
+                result["elements"] = [_text_element(m) for m in cached_matches]
                 result["from_cache"] = True
                 return result
 
         # Fresh OCR search
-        matches = find_text_on_screen(find_text, min_confidence=confidence)
-        for m in matches:
-            cx, cy = m.bbox.center
-            result["elements"].append({
-                "type": "text",
-                "text": m.text,
-                "x": cx,
-                "y": cy,
-                "bbox": m.bbox.to_dict(),
-                "confidence": m.confidence,
-            })
+        matches = find_text_on_screen(
+            find_text, min_confidence=confidence, psm=psm or 3, use_cache=use_cache
+        )
+        result["elements"] = [_text_element(m) for m in matches]
         result["from_cache"] = False
         return result
 
@@ -258,22 +387,21 @@ def analyze_screen(
     if not use_cache:
         invalidate_frame_cache()
 
-    all_text = ocr_full_screen(lang="eng", use_cache=use_cache)
-
-    # Return top elements by confidence
-    sorted_elements = sorted(all_text, key=lambda x: x["confidence"], reverse=True)
-    for elem in sorted_elements[:50]:  # Limit to top 50
-        if elem["confidence"] >= confidence:
-            result["elements"].append({
-                "type": "text",
-                "text": elem["text"],
-                "x": elem["bbox"]["center_x"],
-                "y": elem["bbox"]["center_y"],
-                "bbox": elem["bbox"],
-                "confidence": elem["confidence"],
-            })
-
-    result["total_detected"] = len(all_text)
+    # Return top 50 elements by confidence
+    top_words, total = ocr_full_screen_top(
+        k=50, min_confidence=confidence, lang="eng", use_cache=use_cache, psm=psm or 3
+    )
+    for elem in top_words:
+        result["elements"].append({
+            "type": "text",
+            "text": elem["text"],
+            "x": elem["bbox"]["center_x"],
+            "y": elem["bbox"]["center_y"],
+            "bbox": elem["bbox"],
+            "confidence": elem["confidence"],
+        })
+
+    result["total_detected"] = total
     result["from_cache"] = use_cache and cache_age is not None
 
     return result
@@ -407,6 +535,9 @@ def use_mouse(
     else:
         raise ValueError(f"Unknown action: {action}")
 
+    # The screen may have changed in ways too small for the OCR reuse hash
+    invalidate_frame_cache()
+
     # Always include final position
     final = get_mouse_position()
     result["mouse"] = {"x": final[0], "y": final[1]}
@@ -518,6 +649,9 @@ def use_keyboard(
     else:
         raise ValueError(f"Unknown action: {action}")
 
+    # Typed text may not change the screen enough for the OCR reuse hash
+    invalidate_frame_cache()
+
     return result
 
 
@@ -540,14 +674,9 @@ def get_screen_info() -> dict:
         - mouse: {x, y}
         - cache_age_ms: Age of any cached frame data
     """
-    width, height = get_screen_size()
-    mx, my = get_mouse_position()
-    cache_age = get_frame_cache_age_ms()
-
     return {
-        "screen": {"width": width, "height": height},
-        "mouse": {"x": mx, "y": my},
-        "cache_age_ms": cache_age,
+        **_screen_state(),
+        "cache_age_ms": get_frame_cache_age_ms(),
     }
 
 
@@ -589,9 +718,9 @@ def set_speed(
 @mcp.resource("screen://info")
 def screen_info_resource() -> str:
     """Current screen info as a resource."""
-    width, height = get_screen_size()
-    mx, my = get_mouse_position()
-    return f"Screen: {width}x{height}, Mouse: ({mx}, {my})"
+    state = _screen_state()
+    screen, mouse = state["screen"], state["mouse"]
+    return f"Screen: {screen['width']}x{screen['height']}, Mouse: ({mouse['x']}, {mouse['y']})"
 
 
 # =============================================================================
@@ -5,77 +5,284 @@ Provides screenshot capture, template matching, and OCR-based element detection.
 Includes frame caching and batch OCR for optimized workflow loops.
 """
 
+import bisect
+import functools
+import hashlib
 import io
 import os
+import shlex
 import shutil
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Literal
 
-import pyautogui
+# Tesseract's OpenMP pool spawns worker threads on every call, which costs
+# more than it saves on screen-sized images. Must be set before libtesseract
+# is loaded (tesserocr import or pytesseract subprocess).
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+import numpy as np
 from PIL import Image as PILImage
 
+try:
+    import ahocorasick
+except ImportError:  # Multi-query search falls back to one scan per query
+    ahocorasick = None
+
+try:
+    import cv2
+except ImportError:  # Fall back to pyautogui's template matching
+    cv2 = None
+
+try:
+    import mss
+except ImportError:  # Fall back to pyautogui.screenshot
+    mss = None
+
+try:
+    import re2
+except ImportError:  # Fall back to a per-word substring scan
+    re2 = None
+
+try:
+    import simplejpeg
+except ImportError:  # Fall back to Pillow's JPEG encoder
+    simplejpeg = None
+
+try:
+    from turbojpeg import TJFLAG_FASTDCT, TJPF_BGRA, TJPF_RGB, TJSAMP_420, TurboJPEG
+
+    # One instance for the process; it opens a fresh tj handle per call, so
+    # sharing it across the vision worker threads is safe.
+    _turbojpeg = TurboJPEG()
+except (ImportError, OSError):  # Package or libturbojpeg missing; fall back to Pillow
+    _turbojpeg = None
+
+try:
+    import xxhash
+except ImportError:  # Fall back to hashlib.blake2b
+    xxhash = None
+
+try:
+    import tesserocr
+except ImportError:  # Fall back to the pytesseract subprocess path
+    tesserocr = None
+
+# Pointer and screen-size reads share input's Xlib display connection
+from .input import get_mouse_position
+from .input import get_screen_size as _display_size
+
+
+# =============================================================================
+# Screen Grabbing
+# =============================================================================
+
+@functools.lru_cache(maxsize=None)
+def _pyautogui():
+    """
+    Import pyautogui on first use.
+
+    It pulls in several GUI helper modules and opens an X connection at
+    import, which would otherwise be paid on every server start even when
+    mss and OpenCV cover capture and matching. That connection is made
+    thread-safe by the Xlib.threaded import in .input, which is imported
+    (and so runs it) before anything here touches X.
+    """
+    import pyautogui
+
+    return pyautogui
+
+
+# Persistent mss handles: each holds an X display connection (and XShm
+# segment), so reusing it avoids reconnecting on every grab. mss instances
+# must not be shared across threads, so each vision worker keeps its own
+# rather than serializing grabs behind a lock.
+_sct_local = threading.local()
+
+
+def _get_sct():
+    """Return this thread's mss grabber, creating it on first use."""
+    sct = getattr(_sct_local, "sct", None)
+    if sct is None:
+        sct = _sct_local.sct = mss.mss()
+    return sct
+
+
+PixelFormat = Literal["RGB", "BGRA"]
+
+
+def _grab_screen(region: tuple[int, int, int, int] | None = None) -> tuple[np.ndarray, PixelFormat]:
+    """
+    Grab the screen, or a region of it, as a uint8 array in its native layout.
+
+    Uses mss (XGetImage/XShm directly) when installed, giving HxWx4 BGRA
+    without any conversion; otherwise pyautogui, giving HxWx3 RGB.
+
+    Returns:
+        (pixels, pixel_format)
+    """
+    if mss is None:
+        img = _pyautogui().screenshot(region=region) if region else _pyautogui().screenshot()
+        # convert() copies even when the mode already matches
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        return np.asarray(img), "RGB"
+
+    sct = _get_sct()
+    if region:
+        x, y, w, h = region
+        monitor = {"left": x, "top": y, "width": w, "height": h}
+    else:
+        # Monitor 0 is the whole root window, same as pyautogui's coordinates
+        monitor = sct.monitors[0]
+    shot = sct.grab(monitor)
+
+    # shot.raw is the grabbed bytearray; shot.bgra would copy it into bytes first
+    return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4), "BGRA"
+
 
 # =============================================================================
 # Frame Cache for Workflow Loop Optimization
 # =============================================================================
 
+if cv2 is not None:
+    _GRAY_CODES = {"RGB": cv2.COLOR_RGB2GRAY, "BGRA": cv2.COLOR_BGRA2GRAY}
+
+
+def _pixels_to_pil(pixels: np.ndarray, pixel_format: PixelFormat) -> PILImage.Image:
+    """Wrap RGB or BGRA pixels as an RGB PIL image (one copy, swizzled by Pillow's decoder)."""
+    pixels = np.ascontiguousarray(pixels)
+    if pixel_format == "RGB":
+        return PILImage.fromarray(pixels)
+    height, width = pixels.shape[:2]
+    return PILImage.frombuffer("RGB", (width, height), pixels, "raw", "BGRX", 0, 1)
+
+
 @dataclass
 class CachedFrame:
-    """A cached screenshot with metadata for reuse across OCR queries."""
-    image: PILImage.Image
-    timestamp: float
+    """
+    A cached screenshot with metadata for reuse across OCR queries.
+
+    ``pixels`` is the one canonical copy of the screen, kept in the layout
+    the grabber produced (``pixel_format``: BGRA from mss, RGB otherwise).
+    JPEG encoding and hashing read it directly; the PIL image (for
+    Pillow encoding), grayscale array (for Tesseract and template matching)
+    and RGB array (for colour matching) are derived on first use.
+    """
+    pixels: np.ndarray
+    timestamp: float  # Wall-clock capture time, reported to clients
     width: int
     height: int
-    ocr_data: dict | None = None  # Cached pytesseract output
-    grayscale: PILImage.Image | None = None  # Cached grayscale for template matching
+    pixel_format: PixelFormat = "RGB"
+    # Monotonic capture time for freshness checks; immune to NTP/clock jumps
+    captured_ns: int = field(default_factory=time.monotonic_ns)
+    # (_ocr_key(...), OcrIndex) for this frame; one attribute so a
+    # lock-free reader never pairs one call's key with another's index
+    ocr: tuple | None = None
+    grayscale: np.ndarray | None = None  # Cached grayscale for OCR and template matching
+    rgb: np.ndarray | None = None  # Cached RGB view for colour template matching
+    pil_image: PILImage.Image | None = None  # Cached PIL view for Pillow encoding
+    half_res: dict = field(default_factory=dict)  # grayscale flag -> pyrDown'd array
+    features: tuple | None = None  # (points, descriptors) for feature matching
+    gpu_screen: dict = field(default_factory=dict)  # grayscale flag -> uploaded cv2.cuda_GpuMat
+
+    def as_pil(self) -> PILImage.Image:
+        """Return the frame as a PIL image, converting once."""
+        if self.pil_image is None:
+            self.pil_image = _pixels_to_pil(self.pixels, self.pixel_format)
+        return self.pil_image
+
+    def as_rgb(self) -> np.ndarray:
+        """Return the frame as an HxWx3 RGB array, converting once."""
+        if self.pixel_format == "RGB":
+            return self.pixels
+        if self.rgb is None:
+            if cv2 is not None:
+                self.rgb = cv2.cvtColor(self.pixels, cv2.COLOR_BGRA2RGB)
+            else:
+                self.rgb = np.ascontiguousarray(self.pixels[..., 2::-1])
+        return self.rgb
+
+    def as_gray(self) -> np.ndarray:
+        """Return the frame as a grayscale array, converting once."""
+        if self.grayscale is None:
+            if cv2 is not None:
+                self.grayscale = cv2.cvtColor(self.pixels, _GRAY_CODES[self.pixel_format])
+            else:
+                self.grayscale = np.asarray(self.as_pil().convert("L"))
+        return self.grayscale
 
     def age_ms(self) -> float:
         """Return age in milliseconds."""
-        return (time.time() - self.timestamp) * 1000
+        return (time.monotonic_ns() - self.captured_ns) * 1e-6
 
     def is_stale(self, max_age_ms: float = 500) -> bool:
         """Check if frame is too old."""
-        return self.age_ms() > max_age_ms
+        return time.monotonic_ns() - self.captured_ns > max_age_ms * 1_000_000
+
+
+# Back-to-back observe/analyze calls within this window share one X11 grab
+_FRAME_TTL_MS = 100
 
 
 class FrameCache:
-    """Thread-safe frame cache for reusing screenshots within a workflow loop."""
+    """
+    Thread-safe frame cache for reusing screenshots within a workflow loop.
+
+    Reads are lock-free: the current frame and each frame's OCR result are
+    single attribute stores, which are atomic under the GIL, so a reader
+    sees either the old or the new object, never a mix. The lock only
+    serializes captures, so concurrent callers share one grab.
+    """
 
     def __init__(self):
         self._lock = threading.Lock()
         self._frame: CachedFrame | None = None
 
-    def capture(self, region: tuple[int, int, int, int] | None = None, force: bool = False) -> CachedFrame:
+    def capture(
+        self,
+        region: tuple[int, int, int, int] | None = None,
+        force: bool = False,
+        max_age_ms: float = _FRAME_TTL_MS,
+    ) -> CachedFrame:
         """
         Capture a new frame or return cached one if still fresh.
-        
+
+        Region requests are served by cropping a fresh full-screen frame
+        when one is cached, saving another X11 grab.
+
         Args:
             region: Optional (x, y, width, height) for partial capture
             force: If True, always capture fresh frame
-            
+            max_age_ms: Maximum age of a cached frame to reuse
+
         Returns:
             CachedFrame with screenshot and metadata
         """
+        if not force:
+            frame = self._reuse(region, max_age_ms)
+            if frame is not None:
+                return frame
+
         with self._lock:
-            # Return cached frame if fresh and full-screen
-            if not force and self._frame and not self._frame.is_stale() and region is None:
-                return self._frame
+            if not force:
+                # Another thread may have grabbed while we waited for the lock
+                frame = self._reuse(region, max_age_ms)
+                if frame is not None:
+                    return frame
 
             # Capture new frame
-            if region:
-                img = pyautogui.screenshot(region=region)
-                width, height = region[2], region[3]
-            else:
-                img = pyautogui.screenshot()
-                width, height = img.size
-
+            pixels, pixel_format = _grab_screen(region)
             frame = CachedFrame(
-                image=img,
+                pixels=pixels,
                 timestamp=time.time(),
-                width=width,
-                height=height,
+                width=pixels.shape[1],
+                height=pixels.shape[0],
+                pixel_format=pixel_format,
             )
 
             # Only cache full-screen captures
@@ -84,30 +291,57 @@ class FrameCache:
 
             return frame
 
+    def _reuse(self, region: tuple[int, int, int, int] | None, max_age_ms: float) -> CachedFrame | None:
+        """The cached frame (or a crop of it) if fresh enough, else None."""
+        cached = self._frame
+        if cached is None or cached.is_stale(max_age_ms):
+            return None
+        if region is None:
+            return cached
+        x, y, w, h = region
+        crop = cached.pixels[y:y + h, x:x + w]
+        return CachedFrame(
+            pixels=crop,
+            timestamp=cached.timestamp,
+            captured_ns=cached.captured_ns,
+            width=crop.shape[1],
+            height=crop.shape[0],
+            pixel_format=cached.pixel_format,
+        )
+
     def get_cached(self, max_age_ms: float = 500) -> CachedFrame | None:
         """Get cached frame if available and fresh."""
-        with self._lock:
-            if self._frame and not self._frame.is_stale(max_age_ms):
-                return self._frame
-            return None
+        frame = self._frame
+        if frame and not frame.is_stale(max_age_ms):
+            return frame
+        return None
 
     def invalidate(self):
         """Clear the cache."""
         with self._lock:
             self._frame = None
 
-    def cache_ocr_data(self, ocr_data: dict):
-        """Cache OCR data for the current frame."""
-        with self._lock:
-            if self._frame:
-                self._frame.ocr_data = ocr_data
-
-    def get_cached_ocr(self) -> dict | None:
-        """Get cached OCR data if frame is still fresh."""
-        with self._lock:
-            if self._frame and not self._frame.is_stale() and self._frame.ocr_data:
-                return self._frame.ocr_data
-            return None
+    def cache_ocr(self, index: "OcrIndex", key: tuple, frame: CachedFrame | None = None):
+        """Cache an OCR index on a frame (default: the current frame)."""
+        target = frame or self._frame
+        if target:
+            target.ocr = (key, index)
+
+    def get_cached_ocr(self, key: tuple | None = None) -> "OcrIndex | None":
+        """Get the cached OCR index if frame is still fresh (and produced with ``key``, if given)."""
+        frame = self._frame
+        if frame and not frame.is_stale() and frame.ocr is not None:
+            ocr_key, index = frame.ocr
+            if key is None or ocr_key == key:
+                return index
+        return None
+
+    def get_frame_ocr(self, frame: CachedFrame, key: tuple) -> "OcrIndex | None":
+        """Get the OCR index already computed for ``frame`` with ``key``."""
+        ocr = frame.ocr
+        if ocr is not None and ocr[0] == key:
+            return ocr[1]
+        return None
 
 
 # Global frame cache instance
@@ -157,11 +391,366 @@ class ElementMatch:
         }
 
 
+@functools.lru_cache(maxsize=256)
+def _query_pattern(needle: str):
+    """Compiled RE2 literal pattern for a lowercased query, reused across frames."""
+    return re2.compile(re2.escape(needle))
+
+
+@functools.lru_cache(maxsize=64)
+def _query_automaton(texts: tuple[str, ...]):
+    """
+    Aho-Corasick automaton over a set of queries, reused across frames.
+
+    Agents tend to probe the same label sets on every screen state, so the
+    trie is built once per distinct query tuple. Each payload is the list of
+    original queries sharing that lowercased needle. Returns None when every
+    query is empty.
+    """
+    automaton = ahocorasick.Automaton()
+    for text in texts:
+        needle = text.lower()
+        if needle:
+            queries = automaton.get(needle, [])
+            queries.append(text)
+            automaton.add_word(needle, queries)
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+@dataclass
+class OcrIndex:
+    """
+    Word-level OCR results for one frame, prepared for repeated searches.
+
+    Boxes and confidences are stored column-wise as NumPy arrays; the
+    ElementMatch objects callers receive are only built for words that a
+    search actually returns. Words are lowercased once, so each lookup is
+    a plain substring scan with no per-query allocation.
+    """
+
+    words: list[str]
+    lowers: list[str]
+    boxes: np.ndarray  # (N, 4) int32: x, y, width, height
+    confidences: np.ndarray  # (N,) float64, 0-1
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def match(self, i: int) -> ElementMatch:
+        """Build the ElementMatch for word ``i``."""
+        x, y, w, h = self.boxes[i].tolist()
+        return ElementMatch(
+            bbox=BoundingBox(x=x, y=y, width=w, height=h),
+            confidence=float(self.confidences[i]),
+            text=self.words[i],
+        )
+
+    def _ranked(self, indices, min_confidence: float) -> list[ElementMatch]:
+        """Matches for word ``indices`` above the threshold, best first (reading order on ties)."""
+        idx = np.sort(np.fromiter(indices, dtype=np.intp))
+        idx = idx[self.confidences[idx] >= min_confidence]
+        order = idx[np.argsort(-self.confidences[idx], kind="stable")]
+        return [self.match(i) for i in order.tolist()]
+
+    def select(self, min_confidence: float = 0.0) -> list[ElementMatch]:
+        """All words at or above ``min_confidence``, in reading order."""
+        keep = np.flatnonzero(self.confidences >= min_confidence)
+        return [self.match(i) for i in keep.tolist()]
+
+    def search(self, text: str, min_confidence: float = 0.0) -> list[ElementMatch]:
+        """Find words containing ``text`` (case-insensitive), best confidence first."""
+        needle = text.lower()
+        if re2 is not None and needle:
+            # One DFA scan over all words in C instead of a Python loop
+            starts = self.word_starts
+            found = {
+                bisect.bisect_right(starts, hit.start()) - 1
+                for hit in _query_pattern(needle).finditer(self.joined)
+            }
+        else:
+            # str.find over the joined words runs the scan in C; after a hit,
+            # resume at the next word so each word is reported once
+            joined, starts = self.joined, self.word_starts
+            found = []
+            pos = joined.find(needle) if starts else -1
+            while pos != -1:
+                i = bisect.bisect_right(starts, pos) - 1
+                found.append(i)
+                if i + 1 == len(starts):
+                    break
+                pos = joined.find(needle, starts[i + 1])
+        # Highest confidence first for easy one-shot targeting
+        return self._ranked(found, min_confidence)
+
+    def search_many(self, texts: list[str], min_confidence: float = 0.0) -> dict[str, list[ElementMatch]]:
+        """
+        Search for several strings at once.
+
+        With pyahocorasick installed, all needles are matched in a single pass
+        over the joined words, so cost does not grow with the number of needles.
+
+        Returns:
+            Dict mapping each query to its matches, best confidence first
+        """
+        if ahocorasick is None or len(texts) < 2:
+            return {text: self.search(text, min_confidence) for text in texts}
+
+        automaton = _query_automaton(tuple(texts))
+        if automaton is None:
+            # Only empty queries, which match every word
+            return {text: self.search(text, min_confidence) for text in texts}
+
+        found: dict[str, set[int]] = {text: set() for text in texts}
+        starts = self.word_starts
+        for end, queries in automaton.iter(self.joined):
+            i = bisect.bisect_right(starts, end) - 1
+            for text in queries:
+                found[text].add(i)
+
+        return {
+            text: self._ranked(found[text], min_confidence) if text else self.search(text, min_confidence)
+            for text in texts
+        }
+
+    @functools.cached_property
+    def joined(self) -> str:
+        """Lowercased words joined by NUL, so a needle never spans two words."""
+        return "\x00".join(self.lowers)
+
+    @functools.cached_property
+    def word_starts(self) -> list[int]:
+        """Offset of each word in ``joined``."""
+        starts, pos = [], 0
+        for lower in self.lowers:
+            starts.append(pos)
+            pos += len(lower) + 1
+        return starts
+
+    def top(self, k: int, min_confidence: float = 0.0) -> list[ElementMatch]:
+        """The ``k`` most confident words at or above ``min_confidence``, best first."""
+        if k <= 0:
+            return []
+        confs = self.confidences
+        keep = np.flatnonzero(confs >= min_confidence)
+        if len(keep) > k:
+            # Partial selection: O(n) to find the top k, then sort only those
+            keep = np.sort(keep[np.argpartition(confs[keep], -k)[-k:]])
+        order = keep[np.argsort(-confs[keep], kind="stable")]
+        return [self.match(i) for i in order.tolist()]
+
+    def to_dicts(self) -> list[dict]:
+        """All words as dicts with keys: text, confidence, bbox."""
+        if not self.words:
+            return []
+        # Centers for every word in one vectorized step
+        centers = self.boxes[:, :2] + self.boxes[:, 2:] // 2
+        return [
+            {
+                "bbox": {
+                    "x": x, "y": y, "width": w, "height": h,
+                    "center_x": cx, "center_y": cy,
+                },
+                "confidence": conf,
+                "text": word,
+            }
+            for (x, y, w, h), (cx, cy), conf, word in zip(
+                self.boxes.tolist(), centers.tolist(), self.confidences.tolist(), self.words
+            )
+        ]
+
+
+def _content_hash(pixels: np.ndarray) -> int:
+    """Hash a pixel buffer (xxh3 at memory speed when available, else blake2b)."""
+    buf = np.ascontiguousarray(pixels)
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(buf)
+    return int.from_bytes(hashlib.blake2b(buf, digest_size=8).digest(), "little")
+
+
+_THUMBNAIL_SIZE = 64
+
+
+def _thumbnail(frame: CachedFrame) -> np.ndarray:
+    """64x64 grayscale thumbnail of the frame, averaging away sub-pixel noise."""
+    # Built from the cached grayscale, which OCR on the same frame reuses
+    size = (_THUMBNAIL_SIZE, _THUMBNAIL_SIZE)
+    if cv2 is not None:
+        return cv2.resize(frame.as_gray(), size, interpolation=cv2.INTER_AREA)
+    return np.asarray(PILImage.fromarray(frame.as_gray()).resize(size, PILImage.BOX))
+
+
+# Recently encoded screenshots keyed by pixel hash and encode settings. An idle
+# screen produces identical frames, so repeat captures skip the encoder. Only
+# used with xxhash: blake2b over a full frame costs most of a JPEG encode, so
+# on a changing screen the cache would be a net loss.
+_ENCODED_CACHE_SIZE = 4
+_encoded_cache: OrderedDict[tuple, bytes] = OrderedDict()
+_encoded_lock = threading.Lock()
+
+
+def _encode_frame(
+    frame: CachedFrame,
+    format: Literal["jpeg", "png"],
+    quality: int,
+    optimize_huffman: bool = False,
+    compress_level: int = 3,
+) -> bytes:
+    """
+    Encode a frame to JPEG or PNG bytes, reusing the result for identical pixels
+    (when xxhash is installed).
+
+    JPEG goes through simplejpeg or PyTurboJPEG (both libjpeg-turbo, SIMD DCT)
+    straight from the frame's pixel array, in whatever layout it was grabbed,
+    when installed. The optional Huffman optimization pass is only done by
+    Pillow. PNG uses a fast zlib level and no filter search.
+    """
+    if xxhash is None:
+        return _encode_pixels(frame, format, quality, optimize_huffman, compress_level)
+
+    key = (
+        _content_hash(frame.pixels),
+        frame.pixels.shape,
+        format,
+        quality if format == "jpeg" else compress_level,
+        optimize_huffman,
+    )
+    with _encoded_lock:
+        data = _encoded_cache.get(key)
+        if data is not None:
+            _encoded_cache.move_to_end(key)
+            return data
+
+    data = _encode_pixels(frame, format, quality, optimize_huffman, compress_level)
+
+    with _encoded_lock:
+        _encoded_cache[key] = data
+        while len(_encoded_cache) > _ENCODED_CACHE_SIZE:
+            _encoded_cache.popitem(last=False)
+    return data
+
+
+def _encode_pixels(
+    frame: CachedFrame,
+    format: Literal["jpeg", "png"],
+    quality: int,
+    optimize_huffman: bool,
+    compress_level: int,
+) -> bytes:
+    """Run the actual JPEG/PNG encoder for a frame."""
+    if format == "jpeg":
+        if simplejpeg is not None and not optimize_huffman:
+            return simplejpeg.encode_jpeg(
+                np.ascontiguousarray(frame.pixels),
+                quality=quality,
+                colorspace=frame.pixel_format,
+                fastdct=True,
+            )
+        if _turbojpeg is not None and not optimize_huffman:
+            return _turbojpeg.encode(
+                np.ascontiguousarray(frame.pixels),
+                quality=quality,
+                pixel_format=TJPF_RGB if frame.pixel_format == "RGB" else TJPF_BGRA,
+                jpeg_subsample=TJSAMP_420,
+                flags=TJFLAG_FASTDCT,
+            )
+
+        buffer = io.BytesIO()
+        frame.as_pil().save(buffer, format="JPEG", quality=quality, optimize=optimize_huffman)
+        return buffer.getvalue()
+
+    buffer = io.BytesIO()
+    frame.as_pil().save(buffer, format="PNG", compress_level=compress_level, optimize=False)
+    return buffer.getvalue()
+
+
+# Adaptive JPEG quality range, and the share of thumbnail pixels changed
+# (by more than _ADAPTIVE_PIXEL_DELTA levels) at which quality bottoms out
+_ADAPTIVE_QUALITY_MIN = 40
+_ADAPTIVE_QUALITY_MAX = 85
+_ADAPTIVE_FULL_MOTION = 0.25
+_ADAPTIVE_PIXEL_DELTA = 8
+# Encoded-size budget per frame; a running average above it lowers quality
+_ADAPTIVE_BYTE_BUDGET = 512 * 1024
+
+
+class _AdaptiveQuality:
+    """
+    Per-frame JPEG quality for repeated captures of the same area.
+
+    A static screen is sent at high quality, since the agent will read it
+    closely; while much of it changes (scrolling, animations) quality drops,
+    as those frames are soon superseded. A running average of the encoded
+    sizes also pulls quality down when frames overrun the byte budget.
+    State resets when the captured region changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._region: tuple[int, int, int, int] | None = None
+        self._thumb: np.ndarray | None = None
+        self._bytes_avg: float | None = None
+
+    def choose(self, frame: CachedFrame, region: tuple[int, int, int, int] | None) -> int:
+        """Pick the quality for ``frame`` from its change since the previous capture."""
+        thumb = _thumbnail(frame).astype(np.int16)
+        with self._lock:
+            if region != self._region:
+                self._region, self._thumb, self._bytes_avg = region, None, None
+            previous, self._thumb = self._thumb, thumb
+            bytes_avg = self._bytes_avg
+
+        if previous is None:
+            # Nothing to compare against yet: split the difference
+            motion = 0.5
+        else:
+            changed = np.count_nonzero(np.abs(thumb - previous) > _ADAPTIVE_PIXEL_DELTA) / thumb.size
+            motion = min(1.0, changed / _ADAPTIVE_FULL_MOTION)
+        quality = _ADAPTIVE_QUALITY_MAX - motion * (_ADAPTIVE_QUALITY_MAX - _ADAPTIVE_QUALITY_MIN)
+        if bytes_avg is not None and bytes_avg > _ADAPTIVE_BYTE_BUDGET:
+            quality *= _ADAPTIVE_BYTE_BUDGET / bytes_avg
+        return int(max(_ADAPTIVE_QUALITY_MIN, min(_ADAPTIVE_QUALITY_MAX, round(quality))))
+
+    def record(self, nbytes: int):
+        """Fold the size of the frame just encoded into the running average."""
+        with self._lock:
+            if self._bytes_avg is None:
+                self._bytes_avg = float(nbytes)
+            else:
+                self._bytes_avg = 0.7 * self._bytes_avg + 0.3 * nbytes
+
+
+_adaptive_quality = _AdaptiveQuality()
+
+
+def _encode_capture(
+    frame: CachedFrame,
+    region: tuple[int, int, int, int] | None,
+    format: Literal["jpeg", "png"],
+    quality: int,
+    adaptive_quality: bool,
+    optimize_huffman: bool,
+    compress_level: int,
+) -> tuple[bytes, int]:
+    """Encode a captured frame, picking the JPEG quality adaptively if asked. Returns (bytes, quality)."""
+    if not adaptive_quality or format != "jpeg":
+        return _encode_frame(frame, format, quality, optimize_huffman, compress_level), quality
+    quality = _adaptive_quality.choose(frame, region)
+    data = _encode_frame(frame, format, quality, optimize_huffman, compress_level)
+    _adaptive_quality.record(len(data))
+    return data, quality
+
+
 def capture_screenshot(
     quality: int = 60,
     format: Literal["jpeg", "png"] = "jpeg",
     region: tuple[int, int, int, int] | None = None,
     use_cache: bool = False,
+    optimize_huffman: bool = False,
+    compress_level: int = 3,
+    adaptive_quality: bool = False,
 ) -> tuple[bytes, str]:
     """
     Capture a screenshot and return as compressed bytes.
@@ -170,59 +759,60 @@ def capture_screenshot(
         quality: JPEG quality (1-100), lower = smaller file
         format: Output format (jpeg or png)
         region: Optional (x, y, width, height) tuple for partial capture
-        use_cache: If True, may return cached frame if fresh
+        use_cache: If True, may return a frame captured within the last 100ms
+        optimize_huffman: Extra JPEG Huffman pass (few % smaller, much slower)
+        compress_level: PNG zlib level 0-9 (3 is much faster than 6, slightly larger)
+        adaptive_quality: Ignore ``quality`` and pick a JPEG quality (40-85) per
+            frame: high while the screen is static, lower while it changes or
+            frames run large
 
     Returns:
         Tuple of (image_bytes, format_string)
     """
-    if use_cache and region is None:
-        frame = _frame_cache.capture(region=None, force=False)
-        screenshot = frame.image
-    elif region:
-        screenshot = pyautogui.screenshot(region=region)
-    else:
-        frame = _frame_cache.capture(region=None, force=True)
-        screenshot = frame.image
-
-    buffer = io.BytesIO()
-
-    if format == "jpeg":
-        screenshot.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
-    else:
-        screenshot.save(buffer, format="PNG", optimize=True)
-
-    return buffer.getvalue(), format
+    frame = _frame_cache.capture(region=region, force=not use_cache)
+    data, _ = _encode_capture(
+        frame, region, format, quality, adaptive_quality, optimize_huffman, compress_level
+    )
+    return data, format
 
 
 def capture_with_metadata(
     quality: int = 60,
     format: Literal["jpeg", "png"] = "jpeg",
     region: tuple[int, int, int, int] | None = None,
+    optimize_huffman: bool = False,
+    compress_level: int = 3,
+    adaptive_quality: bool = False,
 ) -> dict:
     """
     Capture a screenshot with display metadata for workflow loops.
 
+    ``adaptive_quality`` picks the JPEG quality per frame as in capture_screenshot.
+
     Returns dict with:
         - image_bytes: The compressed image data
         - format: Image format string
+        - quality: JPEG quality used
+        - ndarray: The captured pixels, shared with the frame cache (do not modify)
+        - pixel_format: Channel layout of ndarray ("BGRA" or "RGB")
         - width: Screen/region width
         - height: Screen/region height
         - timestamp: Capture timestamp
         - mouse_x, mouse_y: Current mouse position
     """
     frame = _frame_cache.capture(region=region, force=True)
-    
-    buffer = io.BytesIO()
-    if format == "jpeg":
-        frame.image.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
-    else:
-        frame.image.save(buffer, format="PNG", optimize=True)
+    image_bytes, quality = _encode_capture(
+        frame, region, format, quality, adaptive_quality, optimize_huffman, compress_level
+    )
 
-    mouse_x, mouse_y = pyautogui.position()
+    mouse_x, mouse_y = get_mouse_position()
 
     return {
-        "image_bytes": buffer.getvalue(),
+        "image_bytes": image_bytes,
         "format": format,
+        "quality": quality,
+        "ndarray": frame.pixels,
+        "pixel_format": frame.pixel_format,
         "width": frame.width,
         "height": frame.height,
         "timestamp": frame.timestamp,
@@ -253,8 +843,15 @@ def _resolve_tesseract_cmd() -> str | None:
     return None
 
 
-def _configure_tesseract():
-    """Ensure pytesseract knows where the tesseract binary is."""
+@functools.lru_cache(maxsize=1)
+def _load_pytesseract():
+    """
+    Import pytesseract and point it at the tesseract binary, once.
+
+    Resolving the binary stats every PATH entry, so it is not repeated per
+    OCR call. Failures raise and are not cached, so installing tesseract
+    (or pytesseract) while the server runs is picked up on the next call.
+    """
     try:
         import pytesseract
     except ImportError:
@@ -271,42 +868,778 @@ def _configure_tesseract():
     return pytesseract
 
 
+def _configure_tesseract():
+    """Ensure pytesseract knows where the tesseract binary is."""
+    pytesseract = _load_pytesseract()
+    # Each tesseract subprocess inherits os.environ at spawn. Re-assert the
+    # single-thread OpenMP limit set at import in case the host process reset
+    # its environment since: concurrent OCR calls each spinning up a full
+    # OpenMP team oversubscribe the CPU and can be tens of times slower.
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    return pytesseract
+
+
+# LSTM engine only: skips loading and running the legacy recognizer, which
+# screen text never needs.
+_TESS_OEM = 1
+
+
+# Upper bound on concurrent OCR jobs (and on tesserocr APIs per language)
+_OCR_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+
+class _TessPool:
+    """
+    Persistent tesserocr APIs for one language.
+
+    Creating an API loads the language model, so keeping them alive turns each
+    OCR call into just SetImage + Recognize. An API is not thread-safe, so each
+    call checks one out; Tesseract releases the GIL while recognizing, so
+    concurrent calls on different APIs run in parallel. APIs are created on
+    demand, up to ``size``. If creating one fails, a waiting caller is woken
+    to try in its place, so a bad language fails every call instead of
+    leaving some blocked.
+    """
+
+    def __init__(self, lang: str, size: int):
+        self.lang = lang
+        self.size = size
+        self._idle: list = []
+        self._created = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def acquire(self):
+        """Check out an API for the duration of the block."""
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                self._cond.wait()
+            if self._idle:
+                api = self._idle.pop()
+            else:
+                # Reserve a slot, then load the model outside the lock
+                self._created += 1
+                api = None
+        if api is None:
+            try:
+                api = tesserocr.PyTessBaseAPI(
+                    lang=self.lang, psm=tesserocr.PSM.AUTO, oem=_TESS_OEM
+                )
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+        try:
+            yield api
+        finally:
+            with self._cond:
+                self._idle.append(api)
+                self._cond.notify()
+
+
+_tess_pools: dict[str, _TessPool] = {}
+_tess_pools_lock = threading.Lock()
+
+# Shared workers for multi-region OCR
+_ocr_executor = ThreadPoolExecutor(max_workers=_OCR_POOL_SIZE, thread_name_prefix="ocr")
+
+
+def _get_tess_pool(lang: str) -> _TessPool:
+    """Return the API pool for ``lang``, creating it on first use."""
+    with _tess_pools_lock:
+        pool = _tess_pools.get(lang)
+        if pool is None:
+            pool = _tess_pools[lang] = _TessPool(lang, _OCR_POOL_SIZE)
+        return pool
+
+
+# Characters seen in typical ASCII UI labels; restricting the recognizer to
+# these shrinks the LSTM beam search.
+ASCII_UI_WHITELIST = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 :/.-_"
+)
+
+
+def _run_ocr(
+    image: PILImage.Image,
+    lang: str = "eng",
+    psm: int = 3,
+    whitelist: str | None = None,
+) -> dict:
+    """
+    Run OCR on an image and return word-level data.
+
+    Uses a pooled persistent tesserocr API when available, otherwise pytesseract.
+
+    Args:
+        image: Image to recognize
+        lang: Tesseract language code
+        psm: Tesseract page segmentation mode (3=auto, 6=uniform block, 11=sparse).
+            6 and 11 skip most of the layout analysis.
+        whitelist: Only recognize these characters (e.g. ASCII_UI_WHITELIST)
+
+    Returns:
+        Dict of parallel lists (text, conf, left, top, width, height), the
+        same shape as pytesseract's image_to_data(output_type=DICT)
+    """
+    if tesserocr is None:
+        pytesseract = _configure_tesseract()
+        config = f"--oem {_TESS_OEM} --psm {psm}"
+        if whitelist:
+            config += " -c " + shlex.quote(f"tessedit_char_whitelist={whitelist}")
+        return pytesseract.image_to_data(
+            image,
+            lang=lang,
+            output_type=pytesseract.Output.DICT,
+            config=config,
+        )
+
+    data = {"text": [], "conf": [], "left": [], "top": [], "width": [], "height": []}
+    level = tesserocr.RIL.WORD
+
+    with _get_tess_pool(lang).acquire() as api:
+        api.SetPageSegMode(psm)
+        api.SetVariable("tessedit_char_whitelist", whitelist or "")
+        api.SetImage(image)
+        try:
+            api.Recognize()
+            iterator = api.GetIterator()
+            if iterator is None:
+                return data
+
+            for word in tesserocr.iterate_level(iterator, level):
+                box = word.BoundingBox(level)
+                if box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                data["text"].append(word.GetUTF8Text(level))
+                data["conf"].append(word.Confidence(level))
+                data["left"].append(x1)
+                data["top"].append(y1)
+                data["width"].append(x2 - x1)
+                data["height"].append(y2 - y1)
+        finally:
+            # Idle pooled APIs would otherwise pin the last image and its results
+            api.Clear()
+
+    return data
+
+
+# Full-screen OCR is split into horizontal strips recognized in parallel. Each
+# strip reaches this far into its neighbours so no text line is cut in two;
+# words are kept only by the strip whose core holds their center.
+_OCR_TILE_OVERLAP = 32
+_OCR_TILE_MIN_HEIGHT = 256
+
+
+# Long-side cap for OCR input. UI text above ~1080p is rendered with HiDPI
+# scaling, so 4K frames keep legible glyphs at half size while Tesseract
+# does a quarter of the work. 1080p-wide screens are left at native size.
+_OCR_MAX_SIDE = 1920
+
+
+def _ocr_frame_data(
+    frame: CachedFrame,
+    lang: str = "eng",
+    psm: int = 3,
+    whitelist: str | None = None,
+    grid: tuple[int, int] | None = None,
+    ocr_scale: float | None = None,
+) -> dict:
+    """
+    OCR a frame, downscaled first, with boxes in frame coordinates.
+
+    ``ocr_scale`` is the resize factor, in (0, 1]; by default the frame is
+    scaled so its long side fits _OCR_MAX_SIDE.
+
+    Tesseract binarizes from grayscale anyway, so it is given the frame's
+    cached grayscale array (shared with template matching): a third of
+    the bytes of RGB and no conversion inside Tesseract.
+
+    ``grid`` is an (n_rows, n_cols) tiling for _ocr_tiled; the default is
+    one horizontal strip per OCR worker.
+    """
+    n_rows, n_cols = grid or (_OCR_POOL_SIZE, 1)
+    gray = frame.as_gray()
+    if ocr_scale is None:
+        scale = min(1.0, _OCR_MAX_SIDE / max(frame.width, frame.height))
+    elif 0 < ocr_scale <= 1:
+        scale = ocr_scale
+    else:
+        raise ValueError(f"ocr_scale must be in (0, 1], got {ocr_scale}")
+    if scale >= 1.0:
+        return _ocr_tiled(gray, lang=lang, psm=psm, whitelist=whitelist, n_rows=n_rows, n_cols=n_cols)
+
+    size = (max(1, round(frame.width * scale)), max(1, round(frame.height * scale)))
+    if cv2 is not None:
+        small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    else:
+        small = np.asarray(PILImage.fromarray(gray).resize(size, PILImage.BOX))
+    data = _ocr_tiled(small, lang=lang, psm=psm, whitelist=whitelist, n_rows=n_rows, n_cols=n_cols)
+
+    inv = 1.0 / scale
+    for column in ("left", "top", "width", "height"):
+        data[column] = [round(int(v) * inv) for v in data[column]]
+    return data
+
+
+def _gray_to_pil(gray: np.ndarray) -> PILImage.Image:
+    """Wrap a (possibly sliced) grayscale array as a PIL "L" image for Tesseract."""
+    return PILImage.fromarray(np.ascontiguousarray(gray))
+
+
+def _ocr_tiled(
+    gray: np.ndarray,
+    lang: str = "eng",
+    psm: int = 3,
+    whitelist: str | None = None,
+    n_rows: int = _OCR_POOL_SIZE,
+    n_cols: int = 1,
+) -> dict:
+    """
+    OCR a grayscale image as an ``n_rows`` x ``n_cols`` grid of overlapping tiles in parallel.
+
+    The default is horizontal strips, which never cut a text line short;
+    a 2-D grid suits sparse screens OCR'd with psm 11. Tiles are views of
+    the image, so only the PIL conversion copies pixels.
+
+    Returns the same column dict as _run_ocr, in image coordinates.
+    """
+    height, width = gray.shape[:2]
+    n_rows = max(1, min(n_rows, height // _OCR_TILE_MIN_HEIGHT))
+    n_cols = max(1, min(n_cols, width // _OCR_TILE_MIN_HEIGHT))
+    if n_rows == n_cols == 1:
+        return _run_ocr(_gray_to_pil(gray), lang=lang, psm=psm, whitelist=whitelist)
+
+    rows = [height * i // n_rows for i in range(n_rows + 1)]
+    cols = [width * i // n_cols for i in range(n_cols + 1)]
+    cells = [(r, c) for r in range(n_rows) for c in range(n_cols)]
+
+    def recognize(cell: tuple[int, int]) -> tuple[dict, int, int]:
+        r, c = cell
+        top = max(0, rows[r] - _OCR_TILE_OVERLAP)
+        bottom = min(height, rows[r + 1] + _OCR_TILE_OVERLAP)
+        left = max(0, cols[c] - _OCR_TILE_OVERLAP)
+        right = min(width, cols[c + 1] + _OCR_TILE_OVERLAP)
+        tile = _gray_to_pil(gray[top:bottom, left:right])
+        return _run_ocr(tile, lang=lang, psm=psm, whitelist=whitelist), left, top
+
+    data = {"text": [], "conf": [], "left": [], "top": [], "width": [], "height": []}
+    for (r, c), (tile, offset_x, offset_y) in zip(cells, _ocr_executor.map(recognize, cells)):
+        for j, text in enumerate(tile["text"]):
+            x = int(tile["left"][j]) + offset_x
+            y = int(tile["top"][j]) + offset_y
+            w = int(tile["width"][j])
+            h = int(tile["height"][j])
+            # Words in an overlap are kept only by the tile whose core holds their center
+            if not (rows[r] <= y + h // 2 < rows[r + 1] and cols[c] <= x + w // 2 < cols[c + 1]):
+                continue
+            data["text"].append(text)
+            data["conf"].append(tile["conf"][j])
+            data["left"].append(x)
+            data["top"].append(y)
+            data["width"].append(w)
+            data["height"].append(h)
+    return data
+
+
+def warmup_ocr(lang: str = "eng"):
+    """
+    Load the OCR model ahead of the first real request.
+
+    Recognizes a tiny blank image so the persistent tesserocr APIs (or with
+    pytesseract, the binary and model files) are loaded. With tesserocr one
+    job per pool slot runs concurrently, so the tiled full-screen OCR finds
+    every API ready instead of loading the model for each strip. Errors are
+    ignored here; the first real OCR call reports them.
+    """
+    image = PILImage.new("L", (32, 32))
+    jobs = _OCR_POOL_SIZE if tesserocr is not None else 1
+    futures = [_ocr_executor.submit(_run_ocr, image, lang=lang) for _ in range(jobs)]
+    for future in futures:
+        try:
+            future.result()
+        except Exception:
+            pass
+
+
+def warmup(lang: str = "eng"):
+    """
+    Pay one-time initialization costs before the first tool call.
+
+    Fills the OCR pool (see warmup_ocr) and runs tiny OpenCV and JPEG
+    encoder calls, which load their SIMD dispatch tables and thread pools
+    on first use.
+    """
+    warmup_ocr(lang)
+    try:
+        blank = np.zeros((64, 64, 3), dtype=np.uint8)
+        frame = CachedFrame(pixels=blank, timestamp=time.time(), width=64, height=64)
+        _encode_pixels(frame, "jpeg", 60, False, 3)
+        if cv2 is not None:
+            cv2.matchTemplate(frame.as_gray(), frame.as_gray()[:8, :8], cv2.TM_CCOEFF_NORMED)
+    except Exception:
+        pass
+
+
+# Perceptual hash of the last frame OCR'd for each (region, shape, settings)
+# slot, with its result. An idle screen hashes the same between agent turns,
+# so its OCR is reused regardless of the frame's age; one slot per key keeps
+# alternating full-screen and region lookups from evicting each other. Input
+# actions clear them via invalidate_frame_cache().
+_PERCEPTUAL_SLOTS = 8
+_last_ocr: OrderedDict[tuple, tuple[int, OcrIndex]] = OrderedDict()
+_last_ocr_lock = threading.Lock()
+
+
+def _perceptual_hash(frame: CachedFrame) -> int:
+    """Hash a 64x64 grayscale thumbnail of the frame, ignoring sub-pixel noise."""
+    return _content_hash(_thumbnail(frame))
+
+
+def _ocr_key(
+    lang: str,
+    psm: int,
+    whitelist: str | None,
+    ocr_scale: float | None = None,
+    grid: tuple[int, int] | None = None,
+) -> tuple:
+    """
+    Cache key for OCR results produced with these settings.
+
+    The tiling is included: Tesseract's layout analysis runs per tile, so
+    a grid reads different words than the default strips.
+    """
+    return (lang, psm, whitelist, ocr_scale, grid)
+
+
+def _frame_ocr(
+    frame: CachedFrame,
+    lang: str = "eng",
+    psm: int = 3,
+    whitelist: str | None = None,
+    grid: tuple[int, int] | None = None,
+    ocr_scale: float | None = None,
+    use_cache: bool = True,
+    region: tuple[int, int, int, int] | None = None,
+) -> OcrIndex:
+    """
+    Return the OCR index for a frame, running Tesseract at most once per frame and settings.
+
+    ``region`` is the screen area the frame shows (None for full screen),
+    used to keep perceptual reuse for different areas apart.
+
+    With ``use_cache`` False, a perceptually identical earlier frame's result
+    is not reused, so the caller always gets a fresh recognition.
+    """
+    key = _ocr_key(lang, psm, whitelist, ocr_scale, grid)
+    index = _frame_cache.get_frame_ocr(frame, key)
+    if index is not None:
+        return index
+
+    slot = (region, frame.pixels.shape, key)
+    frame_hash = _perceptual_hash(frame)
+    if use_cache:
+        with _last_ocr_lock:
+            entry = _last_ocr.get(slot)
+            if entry is not None and entry[0] == frame_hash:
+                index = entry[1]
+                _last_ocr.move_to_end(slot)
+
+    if index is None:
+        data = _ocr_frame_data(frame, lang=lang, psm=psm, whitelist=whitelist, grid=grid, ocr_scale=ocr_scale)
+        index = _build_ocr_index(data)
+        with _last_ocr_lock:
+            _last_ocr[slot] = (frame_hash, index)
+            _last_ocr.move_to_end(slot)
+            while len(_last_ocr) > _PERCEPTUAL_SLOTS:
+                _last_ocr.popitem(last=False)
+
+    _frame_cache.cache_ocr(index, key, frame=frame)
+    return index
+
+
+def _parse_confs(raw: list) -> np.ndarray:
+    """Convert Tesseract confidences (0-100, -1 for non-words) to a 0-1 float array."""
+    try:
+        confs = np.asarray(raw, dtype=np.float64)
+    except (ValueError, TypeError):
+        confs = np.zeros(len(raw), dtype=np.float64)
+        for i, conf in enumerate(raw):
+            try:
+                confs[i] = float(conf)
+            except (ValueError, TypeError):
+                pass
+    # Unparseable entries already read as 0; treat Tesseract's -1 the same
+    # rather than reporting a negative confidence
+    np.maximum(confs, 0.0, out=confs)
+    return confs / 100.0
+
+
+def _build_ocr_index(data: dict) -> OcrIndex:
+    """Build an OcrIndex from image_to_data-style columns, dropping empty words."""
+    keep = [i for i, word in enumerate(data["text"]) if word and word.strip()]
+    words = [data["text"][i] for i in keep]
+    boxes = np.array(
+        [data[column] for column in ("left", "top", "width", "height")], dtype=np.int32
+    ).T.reshape(-1, 4)[keep]
+    confs = _parse_confs(data["conf"])[keep] if keep else np.zeros(0, dtype=np.float64)
+    return OcrIndex(
+        words=words,
+        lowers=[word.lower() for word in words],
+        boxes=boxes,
+        confidences=confs,
+    )
+
+
+def _offset_matches(matches: list[ElementMatch], offset_x: int, offset_y: int) -> list[ElementMatch]:
+    """Shift region-relative matches into screen coordinates."""
+    if not offset_x and not offset_y:
+        return matches
+    return [
+        ElementMatch(
+            bbox=BoundingBox(
+                x=m.bbox.x + offset_x,
+                y=m.bbox.y + offset_y,
+                width=m.bbox.width,
+                height=m.bbox.height,
+            ),
+            confidence=m.confidence,
+            text=m.text,
+        )
+        for m in matches
+    ]
+
+
 def get_screen_size() -> tuple[int, int]:
     """Return the screen size as (width, height)."""
-    return pyautogui.size()
+    return _display_size()
+
+
+def _frame_half_res(frame: CachedFrame, screen: np.ndarray, grayscale: bool) -> np.ndarray:
+    """Return the half-resolution pyramid level of ``screen``, once per frame."""
+    half = frame.half_res.get(grayscale)
+    if half is None:
+        half = cv2.pyrDown(screen)
+        frame.half_res[grayscale] = half
+    return half
+
+
+# Use the CUDA template matcher when OpenCV was built with CUDA and a device exists
+_CUDA = False
+if cv2 is not None and hasattr(cv2, "cuda"):
+    try:
+        _CUDA = cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except cv2.error:  # CUDA build without a usable driver
+        pass
+
+
+def _frame_gpu_screen(frame: CachedFrame, screen: np.ndarray, grayscale: bool):
+    """Upload ``screen`` to the GPU once per frame."""
+    gpu = frame.gpu_screen.get(grayscale)
+    if gpu is None:
+        gpu = cv2.cuda_GpuMat()
+        gpu.upload(screen)
+        frame.gpu_screen[grayscale] = gpu
+    return gpu
+
+
+def _match_template_cuda(gpu_screen, template: np.ndarray) -> np.ndarray:
+    """TM_CCOEFF_NORMED score map computed on the GPU."""
+    mat_type = cv2.CV_8UC1 if template.ndim == 2 else cv2.CV_8UC3
+    matcher = cv2.cuda.createTemplateMatching(mat_type, cv2.TM_CCOEFF_NORMED)
+    gpu_template = cv2.cuda_GpuMat()
+    gpu_template.upload(template)
+    return matcher.match(gpu_screen, gpu_template).download()
+
+
+def _suppress_overlaps(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    scores: np.ndarray,
+    width: int,
+    height: int,
+    max_overlap: float = 0.3,
+) -> list[tuple[int, int, float]]:
+    """Greedy non-max suppression over same-sized boxes, best score first."""
+    order = np.argsort(-scores)
+    xs, ys, scores = xs[order], ys[order], scores[order]
+    alive = np.ones(len(xs), dtype=bool)
+    area = width * height
+
+    kept = []
+    for i in range(len(xs)):
+        if not alive[i]:
+            continue
+        kept.append((int(xs[i]), int(ys[i]), float(scores[i])))
+        ix = np.maximum(0, width - np.abs(xs - xs[i]))
+        iy = np.maximum(0, height - np.abs(ys - ys[i]))
+        inter = ix * iy
+        alive &= inter / (2 * area - inter) <= max_overlap
+
+    return kept
+
+
+@functools.lru_cache(maxsize=64)
+def _load_template(path: str, mtime_ns: int, grayscale: bool) -> np.ndarray:
+    """
+    Decode a template image once, ready for matching.
+
+    Keyed by mtime so edited templates are reloaded. Returns a contiguous
+    uint8 array: (h, w) grayscale or (h, w, 3) RGB.
+    """
+    if grayscale:
+        template = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    else:
+        template = cv2.imread(path, cv2.IMREAD_COLOR)
+    if template is None:
+        raise FileNotFoundError(f"Template image not found or unreadable: {path}")
+    if not grayscale:
+        template = cv2.cvtColor(template, cv2.COLOR_BGR2RGB)
+    return np.ascontiguousarray(template, dtype=np.uint8)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_template_pil(path: str, mtime_ns: int) -> PILImage.Image:
+    """Decode a template once as an RGB PIL image, for matching without OpenCV."""
+    with PILImage.open(path) as image:
+        return image.convert("RGB")
+
+
+def _match_template(
+    screen: np.ndarray,
+    template: np.ndarray,
+    confidence: float,
+    gpu_screen=None,
+) -> list[tuple[int, int, float]]:
+    """Run normalized cross-correlation and return (x, y, score) peaks."""
+    th, tw = template.shape[:2]
+    if th > screen.shape[0] or tw > screen.shape[1]:
+        return []
+
+    if gpu_screen is not None:
+        scores = _match_template_cuda(gpu_screen, template)
+    else:
+        scores = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    ys, xs = np.where(scores >= confidence)
+    if len(xs) == 0:
+        return []
+
+    return _suppress_overlaps(xs, ys, scores[ys, xs], tw, th)
+
+
+# Templates at least this big on both sides are searched coarse-to-fine
+_PYRAMID_MIN_TEMPLATE = 32
+# Coarse pass threshold: well below the requested confidence, since thin UI
+# strokes at odd offsets blur at half resolution (an exact match can score
+# ~0.85 there), and capped so strict searches still keep those candidates.
+# The full-res verification applies the real threshold.
+_PYRAMID_SLACK_CONF = 0.2
+_PYRAMID_COARSE_MAX_CONF = 0.7
+# Full-res search margin around each coarse hit
+_PYRAMID_SLACK_PX = 4
+
+
+def _match_template_pyramid(
+    screen: np.ndarray,
+    screen_half: np.ndarray,
+    template: np.ndarray,
+    template_half: np.ndarray,
+    confidence: float,
+) -> list[tuple[int, int, float]]:
+    """
+    Find candidates at half resolution, then verify each at full resolution.
+
+    The coarse pass touches a quarter of the pixels; the fine pass only
+    looks at small ROIs around coarse hits.
+    """
+    coarse_confidence = min(confidence - _PYRAMID_SLACK_CONF, _PYRAMID_COARSE_MAX_CONF)
+    coarse = _match_template(screen_half, template_half, coarse_confidence)
+    if not coarse:
+        return []
+
+    th, tw = template.shape[:2]
+    sh, sw = screen.shape[:2]
+    slack = _PYRAMID_SLACK_PX
+
+    xs, ys, scores = [], [], []
+    for cx, cy, _ in coarse:
+        x0, y0 = max(0, 2 * cx - slack), max(0, 2 * cy - slack)
+        x1, y1 = min(sw, 2 * cx + tw + slack), min(sh, 2 * cy + th + slack)
+        if x1 - x0 < tw or y1 - y0 < th:
+            continue
+        fine = cv2.matchTemplate(screen[y0:y1, x0:x1], template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (fx, fy) = cv2.minMaxLoc(fine)
+        if score >= confidence:
+            xs.append(x0 + fx)
+            ys.append(y0 + fy)
+            scores.append(score)
+
+    if not xs:
+        return []
+    # Neighbouring coarse hits can refine to the same spot
+    return _suppress_overlaps(np.array(xs), np.array(ys), np.array(scores), tw, th)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_template_half(path: str, mtime_ns: int, grayscale: bool) -> np.ndarray:
+    """Half-resolution pyramid level of a cached template."""
+    return cv2.pyrDown(_load_template(path, mtime_ns, grayscale))
+
+
+# Feature matching: Lowe ratio test, minimum matches for a homography, and
+# the RANSAC reprojection tolerance in pixels
+_FEATURE_RATIO = 0.75
+_FEATURE_MIN_MATCHES = 10
+_FEATURE_RANSAC_PX = 5.0
+
+
+def _feature_detector(nfeatures: int):
+    """SIFT where OpenCV ships it (4.4+), otherwise ORB; created per call as they are not thread-safe."""
+    if hasattr(cv2, "SIFT_create"):
+        return cv2.SIFT_create(nfeatures=nfeatures)
+    return cv2.ORB_create(nfeatures=2 * nfeatures)
+
+
+def _detect_features(gray: np.ndarray, nfeatures: int = 500) -> tuple[np.ndarray, np.ndarray | None]:
+    """Detect keypoints and return (Nx2 float32 points, descriptors)."""
+    keypoints, descriptors = _feature_detector(nfeatures).detectAndCompute(gray, None)
+    points = np.array([kp.pt for kp in keypoints], dtype=np.float32).reshape(-1, 2)
+    return points, descriptors
+
+
+@functools.lru_cache(maxsize=64)
+def _template_features(path: str, mtime_ns: int) -> tuple[np.ndarray, np.ndarray | None, tuple[int, int]]:
+    """Keypoints, descriptors and (height, width) of a template, computed once."""
+    template = _load_template(path, mtime_ns, True)
+    points, descriptors = _detect_features(template)
+    return points, descriptors, template.shape[:2]
+
+
+def _frame_features(frame: CachedFrame) -> tuple[np.ndarray, np.ndarray | None]:
+    """Screen keypoints and descriptors, computed once per frame."""
+    if frame.features is None:
+        # More features than for a template: the screen holds many elements
+        frame.features = _detect_features(frame.as_gray(), nfeatures=5000)
+    return frame.features
+
+
+def _match_features(
+    template_path: str,
+    mtime_ns: int,
+    frame: CachedFrame,
+    confidence: float,
+) -> list[ElementMatch]:
+    """
+    Locate a template by keypoint matching plus a RANSAC homography.
+
+    Tolerates scaling and small rotations that defeat cross-correlation.
+    Finds at most one instance; confidence is the fraction of ratio-test
+    matches that are homography inliers.
+    """
+    tpl_points, tpl_desc, (th, tw) = _template_features(template_path, mtime_ns)
+    scr_points, scr_desc = _frame_features(frame)
+    if tpl_desc is None or scr_desc is None or len(scr_points) < 2:
+        return []
+
+    if tpl_desc.dtype == np.float32:
+        # SIFT: approximate KD-tree search instead of brute force
+        matcher = cv2.FlannBasedMatcher({"algorithm": 1, "trees": 5}, {"checks": 32})
+    else:
+        matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+    pairs = matcher.knnMatch(tpl_desc, scr_desc, k=2)
+
+    good = [p[0] for p in pairs if len(p) == 2 and p[0].distance < _FEATURE_RATIO * p[1].distance]
+    if len(good) < _FEATURE_MIN_MATCHES:
+        return []
+
+    src = tpl_points[[m.queryIdx for m in good]]
+    dst = scr_points[[m.trainIdx for m in good]]
+    homography, inliers = cv2.findHomography(src, dst, cv2.RANSAC, _FEATURE_RANSAC_PX)
+    if homography is None:
+        return []
+    score = float(inliers.sum()) / len(good)
+    if score < confidence:
+        return []
+
+    corners = np.array([[0, 0], [tw, 0], [tw, th], [0, th]], dtype=np.float32).reshape(-1, 1, 2)
+    x, y, w, h = cv2.boundingRect(cv2.perspectiveTransform(corners, homography))
+    return [ElementMatch(bbox=BoundingBox(x=x, y=y, width=w, height=h), confidence=score)]
 
 
 def find_template_on_screen(
     template_path: str,
     confidence: float = 0.8,
     grayscale: bool = True,
+    method: Literal["template", "features"] = "template",
 ) -> list[ElementMatch]:
     """
     Find all occurrences of a template image on screen.
 
+    Uses OpenCV against the cached frame when available, otherwise pyscreeze's
+    exact matcher (via pyautogui) on the same frame.
+
     Args:
         template_path: Path to the template image file
         confidence: Minimum confidence threshold (0.0-1.0)
         grayscale: Whether to use grayscale matching (faster)
+        method: "template" for pixel-exact cross-correlation (all matches), or
+            "features" for SIFT/ORB keypoint matching that survives scaling
+            and theming changes (best single match; needs OpenCV)
 
     Returns:
-        List of ElementMatch objects for each match found
+        List of ElementMatch objects for each match found, best match first
     """
-    try:
-        locations = pyautogui.locateAllOnScreen(
-            template_path,
-            confidence=confidence,
-            grayscale=grayscale,
-        )
+    mtime_ns = os.stat(template_path).st_mtime_ns
+    frame = _frame_cache.capture()
 
-        matches = []
-        for loc in locations:
-            bbox = BoundingBox(x=loc.left, y=loc.top, width=loc.width, height=loc.height)
-            matches.append(ElementMatch(bbox=bbox, confidence=confidence))
+    if cv2 is not None and method == "features":
+        return _match_features(template_path, mtime_ns, frame, confidence)
 
-        return matches
-    except pyautogui.ImageNotFoundException:
-        return []
+    if cv2 is None:
+        # pyscreeze without OpenCV only matches exactly (it rejects confidence),
+        # so search the cached frame for pixel-identical occurrences
+        try:
+            locations = list(_pyautogui().locateAll(
+                _load_template_pil(template_path, mtime_ns),
+                frame.as_pil(),
+                grayscale=grayscale,
+            ))
+        except _pyautogui().ImageNotFoundException:
+            return []
+        return [
+            ElementMatch(
+                bbox=BoundingBox(x=loc.left, y=loc.top, width=loc.width, height=loc.height),
+                confidence=1.0,
+            )
+            for loc in locations
+        ]
+
+    template = _load_template(template_path, mtime_ns, grayscale)
+    screen = frame.as_gray() if grayscale else frame.as_rgb()
+
+    th, tw = template.shape[:2]
+    if _CUDA:
+        # The GPU scans the full frame faster than the CPU pyramid's two passes
+        peaks = _match_template(
+            screen, template, confidence, gpu_screen=_frame_gpu_screen(frame, screen, grayscale)
+        )
+    elif min(th, tw) >= _PYRAMID_MIN_TEMPLATE:
+        peaks = _match_template_pyramid(
+            screen,
+            _frame_half_res(frame, screen, grayscale),
+            template,
+            _load_template_half(template_path, mtime_ns, grayscale),
+            confidence,
+        )
+    else:
+        peaks = _match_template(screen, template, confidence)
+
+    return [
+        ElementMatch(bbox=BoundingBox(x=x, y=y, width=tw, height=th), confidence=score)
+        for x, y, score in peaks
+    ]
 
 
 def find_text_on_screen(
@@ -314,6 +1647,10 @@ def find_text_on_screen(
     lang: str = "eng",
     region: tuple[int, int, int, int] | None = None,
     min_confidence: float = 0.35,
+    psm: int = 3,
+    whitelist: str | None = None,
+    ocr_scale: float | None = None,
+    use_cache: bool = True,
 ) -> list[ElementMatch]:
     """
     Find text on screen using OCR (requires tesseract).
@@ -323,66 +1660,142 @@ def find_text_on_screen(
         lang: Tesseract language code
         region: Optional (x, y, width, height) crop to speed up/target OCR
         min_confidence: Minimum confidence (0-1) to keep a match
+        psm: Tesseract page segmentation mode; 11 (sparse text) is much
+            cheaper than the default 3 on UI screenshots
+        whitelist: Restrict recognized characters (e.g. ASCII_UI_WHITELIST)
+        ocr_scale: Resize factor in (0, 1] applied before OCR; by default the
+            long side is capped at 1920px
+        use_cache: If False, always capture and recognize a fresh frame
 
     Returns:
         List of ElementMatch objects for each text match found, sorted by confidence desc
     """
-    pytesseract = _configure_tesseract()
+    index, offset_x, offset_y = _screen_ocr_index(lang, region, psm, whitelist, ocr_scale, use_cache)
+    matches = index.search(text, min_confidence)
+    return _offset_matches(matches, offset_x, offset_y)
 
-    # Capture current screen
-    if region:
-        screenshot = pyautogui.screenshot(region=region)
-        offset_x, offset_y = region[0], region[1]
-    else:
-        screenshot = pyautogui.screenshot()
-        offset_x = offset_y = 0
 
-    # Run OCR with bounding box data
-    data = pytesseract.image_to_data(screenshot, lang=lang, output_type=pytesseract.Output.DICT)
+def find_any_text_on_screen(
+    keywords: list[str],
+    lang: str = "eng",
+    region: tuple[int, int, int, int] | None = None,
+    min_confidence: float = 0.35,
+    psm: int = 3,
+    whitelist: str | None = None,
+    ocr_scale: float | None = None,
+    use_cache: bool = True,
+) -> dict[str, list[ElementMatch]]:
+    """
+    Find several texts on screen with one OCR pass.
 
-    matches = []
-    search_lower = text.lower()
+    All keywords are matched in a single scan over the OCR words (an
+    Aho-Corasick automaton when pyahocorasick is installed), so checking
+    a list of candidate labels costs about the same as checking one.
 
-    n_boxes = len(data["text"])
-    for i in range(n_boxes):
-        word = data["text"][i]
-        if not word:
-            continue
+    Args:
+        keywords: Texts to search for (case-insensitive substring match)
+        lang: Tesseract language code
+        region: Optional (x, y, width, height) crop to speed up/target OCR
+        min_confidence: Minimum confidence (0-1) to keep a match
+        psm: Tesseract page segmentation mode
+        whitelist: Restrict recognized characters (e.g. ASCII_UI_WHITELIST)
+        ocr_scale: Resize factor in (0, 1] applied before OCR; by default the
+            long side is capped at 1920px
+        use_cache: If False, always capture and recognize a fresh frame
+
+    Returns:
+        Dict mapping each keyword to its matches, sorted by confidence desc
+    """
+    index, offset_x, offset_y = _screen_ocr_index(lang, region, psm, whitelist, ocr_scale, use_cache)
+    found = index.search_many(keywords, min_confidence)
+    return {text: _offset_matches(matches, offset_x, offset_y) for text, matches in found.items()}
 
-        if search_lower in word.lower():
-            try:
-                conf = float(data["conf"][i]) / 100.0
-            except ValueError:
-                conf = 0.0
-
-            if conf >= min_confidence:
-                bbox = BoundingBox(
-                    x=offset_x + data["left"][i],
-                    y=offset_y + data["top"][i],
-                    width=data["width"][i],
-                    height=data["height"][i],
-                )
-                matches.append(ElementMatch(bbox=bbox, confidence=conf, text=word))
 
-    # Highest confidence first for easy one-shot targeting
-    return sorted(matches, key=lambda m: m.confidence, reverse=True)
+def _screen_ocr_index(
+    lang: str = "eng",
+    region: tuple[int, int, int, int] | None = None,
+    psm: int = 3,
+    whitelist: str | None = None,
+    ocr_scale: float | None = None,
+    use_cache: bool = True,
+) -> tuple[OcrIndex, int, int]:
+    """
+    Return the OCR index for the screen (or region) plus its (x, y) offset.
+
+    With ``use_cache`` False, a new frame is grabbed and recognized even if
+    a fresh one (or its OCR) is cached.
+    """
+    if region:
+        offset_x, offset_y = region[0], region[1]
+    else:
+        offset_x = offset_y = 0
+        # Repeat searches against the same fresh frame only rescan the words
+        cached = _frame_cache.get_cached_ocr(_ocr_key(lang, psm, whitelist, ocr_scale)) if use_cache else None
+        if cached is not None:
+            return cached, 0, 0
+
+    # Reuse a just-captured frame if the caller took a screenshot moments ago
+    frame = _frame_cache.capture(region=region, force=not use_cache)
+    index = _frame_ocr(
+        frame, lang, psm, whitelist, ocr_scale=ocr_scale, use_cache=use_cache, region=region
+    )
+    return index, offset_x, offset_y
 
 
 def find_best_text_match(
-    text: str,
+    text: str | list[str],
     lang: str = "eng",
     region: tuple[int, int, int, int] | None = None,
     min_confidence: float = 0.35,
+    psm: int = 3,
+    whitelist: str | None = None,
+    ocr_scale: float | None = None,
+    use_cache: bool = True,
 ) -> ElementMatch | None:
-    """Get the single best text match by confidence, or None if nothing found."""
-    matches = find_text_on_screen(text=text, lang=lang, region=region, min_confidence=min_confidence)
-    return matches[0] if matches else None
+    """
+    Get the single best text match by confidence, or None if nothing found.
+
+    ``text`` may be a list of candidate labels (e.g. ["OK", "Continue", "Next"]);
+    all are searched in one pass over the OCR words.
+    """
+    index, offset_x, offset_y = _screen_ocr_index(lang, region, psm, whitelist, ocr_scale, use_cache)
+    # Result lists come back best first, so only their heads need comparing
+    if isinstance(text, str):
+        matches = index.search(text, min_confidence)
+        best = matches[0] if matches else None
+    else:
+        found = index.search_many(text, min_confidence)
+        best = max((ms[0] for ms in found.values() if ms), key=lambda m: m.confidence, default=None)
+    if best is None:
+        return None
+    return _offset_matches([best], offset_x, offset_y)[0]
+
+
+def _full_screen_ocr_index(
+    lang: str = "eng",
+    use_cache: bool = True,
+    psm: int = 3,
+    whitelist: str | None = None,
+    grid: tuple[int, int] | None = None,
+    ocr_scale: float | None = None,
+) -> OcrIndex:
+    """OCR index of the whole screen, reusing the cached one if fresh and allowed."""
+    if use_cache:
+        cached = _frame_cache.get_cached_ocr(_ocr_key(lang, psm, whitelist, ocr_scale, grid))
+        if cached is not None:
+            return cached
+
+    # Capture fresh frame and cache the OCR index on it
+    frame = _frame_cache.capture(force=True)
+    return _frame_ocr(frame, lang, psm, whitelist, grid=grid, ocr_scale=ocr_scale, use_cache=use_cache)
 
 
 def ocr_full_screen(
     lang: str = "eng",
     use_cache: bool = True,
     psm: int = 3,
+    whitelist: str | None = None,
+    ocr_scale: float | None = None,
 ) -> list[dict]:
     """
     Run OCR on the full screen and return all detected text with positions.
@@ -393,119 +1806,206 @@ def ocr_full_screen(
         lang: Tesseract language code
         use_cache: If True, reuse cached OCR data if frame is still fresh
         psm: Tesseract page segmentation mode (3=auto, 6=uniform block, 11=sparse)
+        whitelist: Restrict recognized characters (e.g. ASCII_UI_WHITELIST)
+        ocr_scale: Resize factor in (0, 1] applied before OCR; by default the
+            long side is capped at 1920px
     
     Returns:
         List of dicts with keys: text, confidence, bbox (x, y, width, height, center_x, center_y)
     """
-    # Check for cached OCR data
-    if use_cache:
-        cached = _frame_cache.get_cached_ocr()
-        if cached:
-            return _ocr_data_to_matches(cached)
+    return _full_screen_ocr_index(lang, use_cache, psm, whitelist, ocr_scale=ocr_scale).to_dicts()
 
-    pytesseract = _configure_tesseract()
-    
-    # Capture fresh frame
-    frame = _frame_cache.capture(force=True)
-    
-    # Run OCR with custom config
-    config = f"--psm {psm}"
-    data = pytesseract.image_to_data(
-        frame.image, 
-        lang=lang, 
-        output_type=pytesseract.Output.DICT,
-        config=config,
-    )
-    
-    # Cache the raw OCR data
-    _frame_cache.cache_ocr_data(data)
-    
-    return _ocr_data_to_matches(data)
 
+def ocr_full_screen_tiled(
+    n_rows: int = 2,
+    n_cols: int = 2,
+    psm: int = 11,
+    lang: str = "eng",
+    use_cache: bool = True,
+    whitelist: str | None = None,
+    ocr_scale: float | None = None,
+) -> list[dict]:
+    """
+    Like ocr_full_screen, but recognize the screen as a grid of tiles in parallel.
 
-def _ocr_data_to_matches(data: dict, min_confidence: float = 0.0) -> list[dict]:
-    """Convert pytesseract output dict to list of match dicts."""
-    results = []
-    n_boxes = len(data["text"])
-    
-    for i in range(n_boxes):
-        word = data["text"][i]
-        if not word or not word.strip():
-            continue
-            
-        try:
-            conf = float(data["conf"][i]) / 100.0
-        except (ValueError, TypeError):
-            conf = 0.0
-            
-        if conf < min_confidence:
-            continue
-            
-        x, y = data["left"][i], data["top"][i]
-        w, h = data["width"][i], data["height"][i]
-        
-        results.append({
-            "text": word,
-            "confidence": conf,
-            "bbox": {
-                "x": x,
-                "y": y,
-                "width": w,
-                "height": h,
-                "center_x": x + w // 2,
-                "center_y": y + h // 2,
-            },
-        })
-    
+    Desktop screenshots are mostly sparse labels rather than page text, so
+    sparse-text mode (psm 11) on smaller tiles skips the page layout analysis
+    that dominates psm 3 on large frames. Tiles overlap slightly; words on a
+    seam are kept once.
+
+    Args:
+        n_rows: Tile rows
+        n_cols: Tile columns
+        psm: Tesseract page segmentation mode for each tile
+        lang: Tesseract language code
+        use_cache: If True, reuse cached OCR data if frame is still fresh
+        whitelist: Restrict recognized characters (e.g. ASCII_UI_WHITELIST)
+        ocr_scale: Resize factor in (0, 1] applied before OCR; by default the
+            long side is capped at 1920px
+
+    Returns:
+        List of dicts with keys: text, confidence, bbox (x, y, width, height, center_x, center_y)
+    """
+    return _full_screen_ocr_index(
+        lang, use_cache, psm, whitelist, grid=(n_rows, n_cols), ocr_scale=ocr_scale
+    ).to_dicts()
+
+
+def ocr_full_screen_top(
+    k: int = 50,
+    min_confidence: float = 0.0,
+    lang: str = "eng",
+    use_cache: bool = True,
+    psm: int = 3,
+    whitelist: str | None = None,
+    ocr_scale: float | None = None,
+) -> tuple[list[dict], int]:
+    """
+    Like ocr_full_screen, but only the ``k`` most confident words.
+
+    Selects with a partial sort over the confidence array rather than
+    sorting and converting every word.
+
+    Returns:
+        (dicts of the top words best first, total number of words detected)
+    """
+    index = _full_screen_ocr_index(lang, use_cache, psm, whitelist, ocr_scale=ocr_scale)
+    return [m.to_dict() for m in index.top(k, min_confidence)], len(index)
+
+
+# Regions closer than this are OCR'd as one image: each Tesseract call has a
+# fixed setup cost, and neighbouring fields (e.g. template hits on one toolbar)
+# read better with their surrounding context.
+_ROI_MERGE_PAD = 8
+
+
+def _merge_regions(
+    regions: list[tuple[int, int, int, int]],
+    bounds: tuple[int, int],
+    pad: int = _ROI_MERGE_PAD,
+) -> list[tuple[tuple[int, int, int, int], list[int]]]:
+    """
+    Union overlapping (padded) regions.
+
+    Returns:
+        (x, y, width, height) of each merged rect, clamped to ``bounds``
+        (width, height), with the indices of the input regions it covers
+    """
+    max_w, max_h = bounds
+    groups = []
+    for i, (x, y, w, h) in enumerate(regions):
+        groups.append([
+            max(0, x - pad), max(0, y - pad),
+            min(max_w, x + w + pad), min(max_h, y + h + pad),
+            [i],
+        ])
+
+    # Growing a rect can make it overlap one already passed, so repeat until stable
+    merged = True
+    while merged:
+        merged = False
+        a = 0
+        while a < len(groups):
+            ga = groups[a]
+            b = a + 1
+            while b < len(groups):
+                gb = groups[b]
+                if ga[0] < gb[2] and gb[0] < ga[2] and ga[1] < gb[3] and gb[1] < ga[3]:
+                    ga[0], ga[1] = min(ga[0], gb[0]), min(ga[1], gb[1])
+                    ga[2], ga[3] = max(ga[2], gb[2]), max(ga[3], gb[3])
+                    ga[4].extend(gb[4])
+                    del groups[b]
+                    merged = True
+                else:
+                    b += 1
+            a += 1
+
+    return [
+        ((x0, y0, max(0, x1 - x0), max(0, y1 - y0)), members)
+        for x0, y0, x1, y1, members in groups
+    ]
+
+
+def ocr_regions(
+    regions: list[tuple[int, int, int, int]],
+    lang: str = "eng",
+    min_confidence: float = 0.0,
+    psm: int = 6,
+    whitelist: str | None = None,
+) -> list[list[ElementMatch]]:
+    """
+    OCR several screen regions concurrently.
+
+    Regions are cropped from one (cached) frame. Overlapping or adjacent
+    regions are merged and recognized once, then each word is assigned
+    back to the regions containing its center. Merged crops are recognized
+    in parallel, each job on its own persistent Tesseract API.
+
+    Args:
+        regions: List of (x, y, width, height) regions
+        lang: Tesseract language code
+        min_confidence: Minimum confidence (0-1) to keep a word
+        psm: Page segmentation mode; 6 (uniform block) suits buttons and fields
+        whitelist: Restrict recognized characters (e.g. ASCII_UI_WHITELIST)
+
+    Returns:
+        One list of word matches per region, in screen coordinates and reading order
+    """
+    frame = _frame_cache.capture()
+    groups = _merge_regions(regions, (frame.width, frame.height))
+
+    def recognize(rect: tuple[int, int, int, int]) -> list[ElementMatch]:
+        x, y, w, h = rect
+        pixels = frame.as_gray()[y:y + h, x:x + w]
+        if pixels.size == 0:
+            return []
+        crop = _gray_to_pil(pixels)
+        index = _build_ocr_index(_run_ocr(crop, lang=lang, psm=psm, whitelist=whitelist))
+        words = index.select(min_confidence)
+        return _offset_matches(words, x, y)
+
+    results: list[list[ElementMatch]] = [[] for _ in regions]
+    for (_, members), words in zip(groups, _ocr_executor.map(recognize, [g[0] for g in groups])):
+        # Crops are padded (and may be unions), so even a lone region keeps
+        # only the words centered inside it
+        for word in words:
+            cx, cy = word.bbox.center
+            for i in members:
+                rx, ry, rw, rh = regions[i]
+                if rx <= cx < rx + rw and ry <= cy < ry + rh:
+                    results[i].append(word)
     return results
 
 
 def find_text_in_ocr_cache(
     text: str,
     min_confidence: float = 0.35,
+    lang: str = "eng",
+    psm: int = 3,
+    whitelist: str | None = None,
+    ocr_scale: float | None = None,
 ) -> list[ElementMatch]:
     """
     Search for text in cached OCR data without re-running OCR.
     
-    Call ocr_full_screen() first to populate the cache.
+    Call ocr_full_screen() first to populate the cache. Only OCR run with
+    the same lang, psm, whitelist and ocr_scale is searched.
     
     Returns:
         List of ElementMatch sorted by confidence desc, or empty if no cache.
     """
-    cached = _frame_cache.get_cached_ocr()
-    if not cached:
+    cached = _frame_cache.get_cached_ocr(_ocr_key(lang, psm, whitelist, ocr_scale))
+    if cached is None:
         return []
-    
-    matches = []
-    search_lower = text.lower()
-    n_boxes = len(cached["text"])
-    
-    for i in range(n_boxes):
-        word = cached["text"][i]
-        if not word:
-            continue
-            
-        if search_lower in word.lower():
-            try:
-                conf = float(cached["conf"][i]) / 100.0
-            except (ValueError, TypeError):
-                conf = 0.0
-                
-            if conf >= min_confidence:
-                bbox = BoundingBox(
-                    x=cached["left"][i],
-                    y=cached["top"][i],
-                    width=cached["width"][i],
-                    height=cached["height"][i],
-                )
-                matches.append(ElementMatch(bbox=bbox, confidence=conf, text=word))
-    
-    return sorted(matches, key=lambda m: m.confidence, reverse=True)
+
+    return cached.search(text, min_confidence)
 
 
 def invalidate_frame_cache():
-    """Invalidate the frame cache, forcing fresh capture on next call."""
+    """Invalidate the frame cache, forcing fresh capture and OCR on next call."""
     _frame_cache.invalidate()
+    with _last_ocr_lock:
+        _last_ocr.clear()
 
 
 def get_frame_cache_age_ms() -> float | None: